@@ -5,7 +5,10 @@ import uuid
 import os
 import time
 import io
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Set
+
+# Reference point for the import and startup timings logged below
+PROCESS_STARTED = time.monotonic()
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,18 +17,38 @@ from fastapi.responses import StreamingResponse
 
 from models import (
     VisaType, SubscriptionLevel, VoiceOption, StartInterviewRequest, StartInterviewResponse,
-    SubmitAnswerRequest, SubmitAnswerResponse, AnswerEvaluation, InterviewSession
+    SubmitAnswerRequest, SubmitAnswerResponse, AnswerEvaluation, InterviewSession,
+    SessionEvaluationsResponse
 )
 from services import initialize_services
-from services.asr import transcribe_audio
-from services.evaluation import evaluate_answer
+from services.asr import asr_service, normalize_language
+from services.evaluation import evaluate_answer, evaluation_cache
+from services.evaluator import EvaluatorService
+from services.llm_clients import llm_clients
+from services.prefetch import QuestionPrefetcher
+from services.voices import VoiceCatalogue
+from services.retention import AudioRetentionManager
+from services.incremental_asr import IncrementalTranscriber
+from services.vad import VADSession, SilenceCompactor
+from services.audio_utils import pcm_to_wav
+from services.audio_buffer import AudioBuffer, AudioBufferFull
+from services.audio_decode import AudioDecoder, StreamingDecoder
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
 logger = logging.getLogger(__name__)
+logger.info(f"Modules imported in {time.monotonic() - PROCESS_STARTED:.2f}s")
 
 # Initialize services
 config, llm_service, tts_service, rag_pipeline = initialize_services()
+question_prefetcher = QuestionPrefetcher(tts_service, config["edge_tts"])
+voice_catalogue = VoiceCatalogue(tts_service, config["edge_tts"])
+incremental_asr_config = config["answers"].get("incremental_asr", {})
+decode_config = config["answers"].get("decode", {})
+audio_decoder = AudioDecoder(decode_config)
+silence_compactor = SilenceCompactor(config["answers"]) if config["answers"].get("trim_silence", True) else None
+evaluation_config = config.get("evaluation", {})
+evaluator_service = EvaluatorService(llm_service)
 
 # Setup FastAPI
 app = FastAPI(title="VISA Interview Training API")
@@ -34,6 +57,42 @@ app = FastAPI(title="VISA Interview Training API")
 os.makedirs("audio_output", exist_ok=True)
 app.mount("/audio", StaticFiles(directory="audio_output"), name="audio")
 
+# Background cleanup of synthesized audio
+def live_audio_files() -> Set[str]:
+    """Filenames of audio still referenced by sessions in progress"""
+    urls = [
+        url
+        for session in active_sessions.values()
+        if session.current_question_index < len(session.questions)
+        for url in session.audio_urls
+    ]
+    urls.extend(question_prefetcher.ready_audio_urls())
+    return {os.path.basename(url) for url in urls}
+
+audio_retention = AudioRetentionManager(
+    tts_service.output_dir, config["edge_tts"].get("retention", {}), live_audio_files
+)
+background_tasks: List[asyncio.Task] = []
+
+@app.on_event("startup")
+async def start_background_tasks():
+    background_tasks.append(asyncio.create_task(audio_retention.run()))
+    # The embedding model and Chroma load after the server starts accepting requests
+    background_tasks.append(rag_pipeline.start_warm_up())
+    logger.info(f"Startup complete in {time.monotonic() - PROCESS_STARTED:.2f}s")
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await asr_service.aclose()
+    await llm_clients.aclose()
+    rag_pipeline.shutdown()
+    evaluation_cache.close()
+    if tts_service.cache:
+        tts_service.cache.flush()
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -46,40 +105,30 @@ app.add_middleware(
 # In-memory state
 active_sessions: Dict[str, InterviewSession] = {}
 active_ws_connections: Dict[str, WebSocket] = {}
-session_audio_chunks: Dict[str, List[bytes]] = {}
+session_audio_buffers: Dict[str, AudioBuffer] = {}
+# Languages detected in the segments of the answer being recorded, weighted by segment size
+session_segment_languages: Dict[str, Dict[str, int]] = {}
 
 @app.get("/")
 async def root():
     return {"status": "VISA Interview Training API is running"}
 
-@app.get("/api/voices")
-async def get_voices() -> List[VoiceOption]:
-    try:
-        voices = await tts_service.get_available_voices()
-        return [
-            VoiceOption(
-                voice_id=voice.get("ShortName", ""),
-                name=voice.get("ShortName", "").split("-")[-1],
-                language=voice.get("Locale", "").split("-")[0],
-                gender=voice.get("Gender", "")
-            ) for voice in voices
-        ]
-    except Exception as e:
-        logger.error(f"Error getting voices: {str(e)}")
-        return [
-            VoiceOption(
-                voice_id=voice,
-                name=voice.split("-")[-1],
-                language="-".join(voice.split("-")[0:2])
-            ) for voice in config["edge_tts"]["voice_options"]
-        ]
+@app.get("/api/voices", response_model=List[VoiceOption])
+async def get_voices():
+    return Response(content=voice_catalogue.get_payload(), media_type="application/json")
 
 @app.post("/api/startInterview", response_model=StartInterviewResponse)
 async def start_interview(request: StartInterviewRequest):
+    language = normalize_language(request.language)
+    if request.language and language is None:
+        raise HTTPException(status_code=422, detail=f"Unsupported language: {request.language}")
     try:
         max_questions = config["subscription"][request.subscription_level.value]["max_questions"]
         session_id = str(uuid.uuid4())
-        questions = await rag_pipeline.get_questions(visa_type=request.visa_type.value, num_questions=max_questions)
+        # Seeding with the session id varies question sets between interviews reproducibly
+        questions = await rag_pipeline.get_questions(
+            visa_type=request.visa_type.value, num_questions=max_questions, seed=uuid.UUID(session_id).int
+        )
         first_question = questions[0]
         audio_url = await tts_service.synthesize(first_question, request.voice_id)
 
@@ -88,12 +137,16 @@ async def start_interview(request: StartInterviewRequest):
             visa_type=request.visa_type,
             subscription_level=request.subscription_level,
             voice_id=request.voice_id,
+            language=language,
             questions=questions,
             current_question_index=0,
             answers=[],
-            evaluations=[]
+            evaluations=[],
+            audio_urls=[audio_url]
         )
-        session_audio_chunks[session_id] = []
+
+        # Synthesize the remaining questions while the user answers the first
+        question_prefetcher.schedule(session_id, questions, request.voice_id, start_index=1)
 
         return StartInterviewResponse(
             session_id=session_id,
@@ -106,11 +159,31 @@ async def start_interview(request: StartInterviewRequest):
         logger.error(f"Error starting interview: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to start interview")
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime statistics of background subsystems"""
+    return {
+        "tts": tts_service.get_stats(),
+        "tts_cache": tts_service.cache.get_stats() if tts_service.cache else None,
+        "audio_retention": audio_retention.get_stats(),
+        "silence_compaction": silence_compactor.get_stats() if silence_compactor else None,
+        "audio_decode": audio_decoder.get_stats(),
+        "asr": asr_service.get_stats(),
+        "llm": llm_clients.get_stats(),
+        "evaluation_cache": evaluation_cache.get_stats(),
+        "rag": rag_pipeline.get_stats(),
+    }
+
 # Add missing health endpoint
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": time.time()}
+    return {
+        "status": "healthy",
+        "ready": rag_pipeline.ready,
+        "warmup": {"rag": rag_pipeline.warmup},
+        "timestamp": time.time()
+    }
 
 # Add WebSocket health endpoint
 @app.websocket("/ws/health")
@@ -132,6 +205,10 @@ async def text_to_speech(request: dict):
     try:
         text = request.get("text", "")
         voice = request.get("voice", config["edge_tts"].get("default_voice", "en-US-AriaNeural"))
+
+        # Stream audio chunks as they are synthesized so playback can start early
+        if request.get("stream", False):
+            return StreamingResponse(tts_service.stream(text, voice), media_type=tts_service.media_type)
         
         audio_url = await tts_service.synthesize(text, voice)
         
@@ -160,40 +237,31 @@ async def submit_answer(request: SubmitAnswerRequest):
             logger.error(f"Session {request.session_id}: current_question_index {current_idx} out of range for questions length {len(session.questions)}")
             raise HTTPException(status_code=400, detail="No more questions in this session.")
 
-        session.answers.append(request.answer_text)
-        current_question = session.questions[current_idx]
-        evaluation_result = await evaluate_answer(current_question, request.answer_text, session.visa_type.value)
-
-        # Ensure field names match the AnswerEvaluation model
-        if "fluency" in evaluation_result:
-            evaluation_result["fluency_score"] = evaluation_result.pop("fluency")
-        if "confidence" in evaluation_result:
-            evaluation_result["confidence_score"] = evaluation_result.pop("confidence")
-        if "content_accuracy" in evaluation_result:
-            evaluation_result["content_accuracy_score"] = evaluation_result.pop("content_accuracy")
-        if "clarity" in evaluation_result:
-            evaluation_result["clarity_score"] = evaluation_result.pop("clarity")
-        if "response_time" in evaluation_result:
-            evaluation_result["response_time_score"] = evaluation_result.pop("response_time")
-
-        evaluation = AnswerEvaluation(**evaluation_result)
-        session.evaluations.append(evaluation)
-        session.current_question_index += 1
+        evaluation_task = record_answer(session, request.answer_text)
 
         # After increment, check if interview is complete
         if session.current_question_index >= len(session.questions):
-            final_eval = await session.generate_final_evaluation(llm_service)
-            return SubmitAnswerResponse(session_complete=True, last_evaluation=evaluation, final_evaluation=final_eval)
+            question_prefetcher.cancel(session.session_id)
+            final_eval = await session.generate_final_evaluation(llm_service, incremental=final_evaluation_incremental())
+            return SubmitAnswerResponse(
+                session_complete=True, last_evaluation=session.evaluations[current_idx], final_evaluation=final_eval
+            )
 
+        # The next question's audio is fetched while the answer is being evaluated
         next_question = session.questions[session.current_question_index]
-        audio_url = await tts_service.synthesize(next_question, session.voice_id)
+        audio_url = await question_prefetcher.get_audio_url(
+            session.session_id, session.current_question_index, next_question, session.voice_id
+        )
+        session.audio_urls.append(audio_url)
+        if evaluation_config.get("mode", "two_phase") != "two_phase":
+            await evaluation_task
         return SubmitAnswerResponse(
             session_complete=False,
             question_text=next_question,
             audio_url=audio_url,
             question_index=session.current_question_index + 1,
             total_questions=len(session.questions),
-            last_evaluation=evaluation
+            last_evaluation=session.evaluations[current_idx]
         )
     except HTTPException:
         raise
@@ -201,6 +269,19 @@ async def submit_answer(request: SubmitAnswerRequest):
         logger.error(f"Error processing answer: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing answer: {str(e)}")
 
+@app.get("/api/session/{session_id}/evaluations", response_model=SessionEvaluationsResponse)
+async def get_session_evaluations(session_id: str):
+    """Poll the evaluations of a session's answers as they are refined"""
+    if session_id not in active_sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    session = active_sessions[session_id]
+    return SessionEvaluationsResponse(
+        session_id=session_id,
+        evaluations=session.evaluations,
+        pending=session.pending_evaluations(),
+        session_complete=session.current_question_index >= len(session.questions)
+    )
+
 # Update WebSocket stream handling
 @app.websocket("/ws/stream")
 async def websocket_endpoint(websocket: WebSocket):
@@ -208,8 +289,85 @@ async def websocket_endpoint(websocket: WebSocket):
     session_id = None
     ping_task = None
     is_recording = False
+    transcriber = None
+    vad = None
+    stream_decoder = None
+    decoded = None
+    decoded_full = False
+    pcm_sample_rate = None
+    question_asked_at = time.monotonic()
+    response_time = None
 
     try:
+        async def complete_recording(auto: bool = False):
+            """Transcribe the buffered answer and move the interview on"""
+            nonlocal is_recording, transcriber, vad, stream_decoder, decoded, question_asked_at
+            is_recording = False
+            await websocket.send_json({"type": "status", "recording": False, "processing": True, "auto": auto})
+            if stream_decoder:
+                # Drain ffmpeg so the decoded copy holds the tail of the answer
+                try:
+                    await stream_decoder.finish(audio_decoder.timeout)
+                except Exception as e:
+                    logger.warning(f"Session {session_id}: streaming decode failed: {str(e)}")
+                    if decoded is not None:
+                        # The transcriber missed the tail too; transcribe the recording in full
+                        decoded.release()
+                        decoded = None
+                        if transcriber:
+                            transcriber.cancel()
+                            transcriber = None
+                stream_decoder = None
+            vad = None
+            buffer = session_audio_buffers.pop(session_id, None)
+            active_transcriber, transcriber = transcriber, None
+            active_decoded, decoded = decoded, None
+            if buffer is not None and len(buffer):
+                try:
+                    transcript = await transcribe_answer(
+                        session_id, buffer, active_transcriber, pcm_sample_rate, active_decoded
+                    )
+                finally:
+                    # Free the answer audio before the slower evaluation stages
+                    buffer.release()
+                    if active_decoded is not None:
+                        active_decoded.release()
+                await process_answer(websocket, session_id, transcript, response_time)
+                question_asked_at = time.monotonic()
+            else:
+                if active_transcriber:
+                    active_transcriber.cancel()
+                if active_decoded is not None:
+                    active_decoded.release()
+                await websocket.send_json({"type": "error", "message": "No audio received"})
+
+        def on_decoded(pcm: bytes):
+            """Feed audio decoded from the browser recording to VAD and the decoded copy"""
+            nonlocal decoded_full
+            vad.process(pcm)
+            if decoded is None or decoded_full:
+                return
+            try:
+                decoded.append(pcm)
+            except AudioBufferFull as e:
+                logger.info(f"Session {session_id}: {str(e)}, ending answer")
+                decoded_full = True
+                return
+            if transcriber:
+                transcriber.add_chunk(pcm, boundary=vad.at_boundary)
+
+        def drop_decoded():
+            """Fall back to the compressed recording when the decoded copy is incomplete"""
+            nonlocal decoded, transcriber
+            if decoded is None:
+                return
+            decoded.release()
+            decoded = None
+            if transcriber:
+                # Start over on the recording, which add_chunk catches up on
+                transcriber.cancel()
+                transcriber = create_transcriber(websocket, session_id, session_audio_buffers[session_id])
+
         # Ping task to keep connection alive
         async def send_ping():
             try:
@@ -229,7 +387,6 @@ async def websocket_endpoint(websocket: WebSocket):
                 await websocket.send_json({"type": "error", "message": "Invalid session ID"})
                 return
             active_ws_connections[session_id] = websocket
-            session_audio_chunks[session_id] = []
             await websocket.send_json({"type": "ready", "message": "Connected and ready"})
         except asyncio.TimeoutError:
             await websocket.send_json({"type": "error", "message": "Connection timed out waiting for session ID"})
@@ -246,20 +403,68 @@ async def websocket_endpoint(websocket: WebSocket):
                         await websocket.send_json({"type": "pong"})
                     elif msg_type == "end_session":
                         break
+                    elif msg_type == "tts_stream":
+                        await stream_tts(websocket, session_id, msg)
                     elif msg_type == "start_recording":
-                        session_audio_chunks[session_id] = []
+                        if transcriber:
+                            transcriber.cancel()
+                        if stream_decoder:
+                            stream_decoder.close()
+                        if decoded is not None:
+                            decoded.release()
+                        transcriber, stream_decoder, decoded, decoded_full = None, None, None, False
+                        pcm_sample_rate = msg.get("sample_rate", 16000) if msg.get("format") == "pcm16" else None
+                        release_audio_buffer(session_id)
+                        buffer = AudioBuffer(config["answers"], pcm_sample_rate * 2 if pcm_sample_rate else None)
+                        session_audio_buffers[session_id] = buffer
+                        if pcm_sample_rate:
+                            vad = VADSession(config["answers"], pcm_sample_rate)
+                        else:
+                            # Browser WebM/Opus is decoded as it arrives so VAD can end the answer
+                            # and, unless the recording is uploaded as is, the PCM is ready to trim
+                            vad = VADSession(config["answers"], audio_decoder.sample_rate)
+                            if upload_decoded():
+                                decoded = AudioBuffer(config["answers"], audio_decoder.bytes_per_second)
+                            stream_decoder = await open_answer_decoder(session_id, on_decoded)
+                            if stream_decoder is None:
+                                vad, decoded = None, None
+                        if incremental_asr_config.get("enabled", True):
+                            transcriber = (
+                                create_transcriber(websocket, session_id, decoded, audio_decoder.sample_rate)
+                                if decoded is not None else
+                                create_transcriber(websocket, session_id, buffer, pcm_sample_rate)
+                            )
                         is_recording = True
+                        response_time = time.monotonic() - question_asked_at
                         await websocket.send_json({"type": "status", "recording": True})
                     elif msg_type == "recording-complete":
-                        is_recording = False
-                        await websocket.send_json({"type": "status", "recording": False, "processing": True})
-                        if session_id in session_audio_chunks and session_audio_chunks[session_id]:
-                            full_audio = b"".join(session_audio_chunks[session_id])
-                            await process_answer(websocket, session_id, full_audio)
-                        else:
-                            await websocket.send_json({"type": "error", "message": "No audio received"})
+                        if is_recording:
+                            await complete_recording()
                 elif "bytes" in data and is_recording and session_id:
-                    session_audio_chunks[session_id].append(data["bytes"])
+                    chunk = data["bytes"]
+                    try:
+                        session_audio_buffers[session_id].append(chunk)
+                    except AudioBufferFull as e:
+                        logger.info(f"Session {session_id}: {str(e)}, ending answer")
+                        await complete_recording(auto=True)
+                        continue
+                    if stream_decoder:
+                        # VAD runs on the decoded audio as ffmpeg delivers it, a little behind
+                        try:
+                            await stream_decoder.feed(chunk)
+                        except Exception as e:
+                            logger.warning(f"Session {session_id}: streaming decode failed: {str(e)}")
+                            stream_decoder.close()
+                            vad, stream_decoder = None, None
+                            drop_decoded()
+                        speech_ended = (vad.speech_ended or decoded_full) if vad else False
+                    else:
+                        speech_ended = vad.process(chunk) if vad else False
+                    if transcriber and decoded is None:
+                        # Decoded audio reaches the transcriber through on_decoded instead
+                        transcriber.add_chunk(chunk, boundary=vad.at_boundary if vad else False)
+                    if speech_ended:
+                        await complete_recording(auto=True)
             except asyncio.TimeoutError:
                 try:
                     await websocket.send_json({"type": "ping"})
@@ -284,6 +489,12 @@ async def websocket_endpoint(websocket: WebSocket):
         except:
             pass
     finally:
+        if transcriber:
+            transcriber.cancel()
+        if stream_decoder:
+            stream_decoder.close()
+        if decoded is not None:
+            decoded.release()
         if ping_task:
             ping_task.cancel()
             try:
@@ -293,52 +504,278 @@ async def websocket_endpoint(websocket: WebSocket):
         if session_id:
             if session_id in active_ws_connections:
                 del active_ws_connections[session_id]
-            if session_id in session_audio_chunks:
-                session_audio_chunks[session_id] = []
+            release_audio_buffer(session_id)
+            session_segment_languages.pop(session_id, None)
+
+async def stream_tts(websocket: WebSocket, session_id: str, msg: dict):
+    """Stream synthesized audio to the client as binary frames"""
+    session = active_sessions[session_id]
+    text = msg.get("text")
+    if not text and session.current_question_index < len(session.questions):
+        text = session.questions[session.current_question_index]
+    voice = msg.get("voice") or session.voice_id
+
+    await websocket.send_json({"type": "tts_stream_start", "media_type": tts_service.media_type})
+    try:
+        async for chunk in tts_service.stream(text or "", voice):
+            await websocket.send_bytes(chunk)
+    except Exception as e:
+        logger.error(f"TTS streaming error: {str(e)}")
+        await websocket.send_json({"type": "error", "message": "Error streaming audio"})
+        return
+    await websocket.send_json({"type": "tts_stream_end"})
+
+def release_audio_buffer(session_id: str):
+    """Drop any buffered answer audio for a session"""
+    buffer = session_audio_buffers.pop(session_id, None)
+    if buffer is not None:
+        buffer.release()
+
+def pin_language(session_id: str, detected: Optional[str]):
+    """Pin the session language to the language Whisper detects in the first complete answer"""
+    session = active_sessions.get(session_id)
+    if session is None or session.language or not detected:
+        return
+    session.language = detected
+    logger.info(f"Session {session_id}: pinned transcription language to {detected}")
+
+def session_language(session_id: str) -> Optional[str]:
+    """Return the pinned language of a session, if any"""
+    session = active_sessions.get(session_id)
+    return session.language if session else None
+
+async def transcribe_for_session(session_id: str, audio_data, **upload) -> str:
+    """Transcribe a full answer in the session language, pinning it on first detection"""
+    result = await asr_service.transcribe(audio_data, language=session_language(session_id), **upload)
+    pin_language(session_id, result.language)
+    return result.text
+
+def create_transcriber(
+    websocket: WebSocket, session_id: str, buffer: AudioBuffer, pcm_sample_rate: Optional[int] = None
+) -> IncrementalTranscriber:
+    """Create a transcriber that pushes partial transcripts to the client"""
+    async def send_partial(text: str):
+        await websocket.send_json({"type": "transcription_partial", "text": text})
+
+    upload = {"filename": "audio.wav", "content_type": "audio/wav"} if pcm_sample_rate else {}
+
+    # A segment is too short to detect the language reliably; the answer's
+    # segments vote once it has been transcribed in full
+    languages: Dict[str, int] = {}
+    session_segment_languages[session_id] = languages
+
+    async def transcribe(segment: bytes) -> str:
+        result = await asr_service.transcribe_detailed(segment, language=session_language(session_id), **upload)
+        if result.language:
+            languages[result.language] = languages.get(result.language, 0) + len(segment)
+        return result.text
+
+    return IncrementalTranscriber(
+        transcribe, incremental_asr_config, buffer, on_partial=send_partial,
+        pcm_sample_rate=pcm_sample_rate, compactor=silence_compactor
+    )
+
+async def finish_transcription(transcriber: Optional[IncrementalTranscriber]) -> Optional[str]:
+    """Stitch the incremental transcript, or None to transcribe the full answer instead"""
+    if transcriber is None:
+        return None
+    try:
+        return await transcriber.finish()
+    except Exception as e:
+        logger.warning(f"Incremental transcription failed, falling back to full transcription: {str(e)}")
+        transcriber.cancel()
+        return None
+
+async def transcribe_answer(
+    session_id: str,
+    buffer: AudioBuffer,
+    transcriber: Optional[IncrementalTranscriber],
+    pcm_sample_rate: Optional[int],
+    decoded: Optional[AudioBuffer] = None
+) -> str:
+    """Transcribe a recorded answer, preferring the incremental transcript"""
+    languages = session_segment_languages.pop(session_id, {})
+    transcript = await finish_transcription(transcriber)
+    if transcript is not None:
+        if languages:
+            pin_language(session_id, max(languages, key=languages.get))
+        if transcriber.compactor:
+            logger.info(f"Session {session_id}: silence compaction saved {transcriber.bytes_saved} bytes")
+        return transcript
+
+    if pcm_sample_rate:
+        with buffer.view() as audio:
+            return await transcribe_pcm(session_id, audio, pcm_sample_rate)
+    if decoded is not None and len(decoded):
+        # Decoded while it was recorded
+        with decoded.view() as pcm:
+            return await transcribe_pcm(session_id, pcm, audio_decoder.sample_rate)
+
+    with buffer.view() as audio:
+        if not upload_decoded():
+            return await transcribe_for_session(session_id, audio)
+        pcm = await decode_answer(session_id, audio)
+        if pcm is None:
+            return await transcribe_for_session(session_id, audio)
+    return await transcribe_pcm(session_id, pcm, audio_decoder.sample_rate)
+
+def upload_decoded() -> bool:
+    """Whether compressed answers are decoded and trimmed before upload rather than sent as recorded"""
+    return decode_config.get("upload_format", "flac") != "original"
+
+async def open_answer_decoder(session_id: str, on_pcm: Callable[[bytes], None]) -> Optional[StreamingDecoder]:
+    """Start decoding a compressed recording to PCM as it arrives"""
+    if not decode_config.get("enabled", True) or not decode_config.get("streaming", True) or not audio_decoder.available:
+        return None
+    try:
+        return await audio_decoder.open_stream(on_pcm)
+    except Exception as e:
+        logger.warning(f"Session {session_id}: failed to start streaming decode: {str(e)}")
+        return None
 
-async def process_answer(websocket: WebSocket, session_id: str, audio_data: bytes):
+async def decode_answer(session_id: str, audio: memoryview) -> Optional[bytes]:
+    """Decode a compressed answer to 16 kHz mono PCM with ffmpeg"""
+    if not decode_config.get("enabled", True) or not audio_decoder.available:
+        return None
+    try:
+        pcm = await audio_decoder.decode(audio)
+    except Exception as e:
+        logger.warning(f"Session {session_id}: failed to decode answer audio: {str(e)}")
+        return None
+    logger.info(f"Session {session_id}: decoded answer of {len(pcm) / audio_decoder.bytes_per_second:.1f}s")
+    return pcm
+
+async def transcribe_pcm(session_id: str, pcm, sample_rate: int) -> str:
+    """Compact silence in PCM answer audio and upload it to ASR"""
+    if silence_compactor:
+        pcm, report = silence_compactor.compact(pcm, sample_rate)
+        logger.info(f"Session {session_id}: silence compaction saved {report['bytes_saved']} bytes")
+    if decode_config.get("upload_format") == "flac" and audio_decoder.available and sample_rate == audio_decoder.sample_rate:
+        try:
+            flac = await audio_decoder.encode_flac(pcm)
+        except Exception as e:
+            logger.warning(f"Session {session_id}: FLAC encoding failed, uploading WAV: {str(e)}")
+        else:
+            return await transcribe_for_session(session_id, flac, filename="audio.flac", content_type="audio/flac")
+    return await transcribe_for_session(
+        session_id, pcm_to_wav(pcm, sample_rate), filename="audio.wav", content_type="audio/wav"
+    )
+
+def final_evaluation_incremental() -> bool:
+    """Whether the final evaluation is synthesized from the rolling summary"""
+    return evaluation_config.get("final_mode", "incremental") == "incremental"
+
+def create_final_evaluation_streamer(websocket: WebSocket):
+    """Create a callback pushing the final evaluation's feedback while it is generated"""
+    last_sent = None
+
+    async def send_partial(partial: dict):
+        nonlocal last_sent
+        update = {
+            field: partial[field]
+            for field in ("feedback_summary", "strengths", "areas_to_improve")
+            if field in partial
+        }
+        serialized = json.dumps(update, sort_keys=True)
+        if not update or serialized == last_sent:
+            return
+        last_sent = serialized
+        try:
+            await websocket.send_json({"type": "final_evaluation_partial", "evaluation": update})
+        except Exception as e:
+            # A lost client must not abort generation; the result is still stored
+            logger.warning(f"Failed to send partial final evaluation: {str(e)}")
+
+    return send_partial
+
+def to_answer_evaluation(eval_result: dict) -> AnswerEvaluation:
+    """Build an AnswerEvaluation from an LLM result, tolerating short field names"""
+    for name in ("fluency", "confidence", "content_accuracy", "clarity", "response_time"):
+        if name in eval_result:
+            eval_result[f"{name}_score"] = eval_result.pop(name)
+    return AnswerEvaluation(**eval_result)
+
+async def refine_evaluation(session: InterviewSession, idx: int, question: str, transcript: str):
+    """Replace a provisional evaluation with the LLM one and push it to the client"""
+    try:
+        evaluation = to_answer_evaluation(await evaluate_answer(question, transcript, session.visa_type.value))
+    except Exception as e:
+        logger.error(f"Session {session.session_id}: failed to evaluate answer {idx + 1}: {str(e)}")
+        return
+    session.record_evaluation(idx, evaluation)
+
+    websocket = active_ws_connections.get(session.session_id)
+    if websocket is not None and evaluation_config.get("mode", "two_phase") == "two_phase":
+        try:
+            await websocket.send_json({
+                "type": "evaluation_update",
+                "question_index": idx + 1,
+                "evaluation": evaluation.dict()
+            })
+        except Exception as e:
+            logger.warning(f"Session {session.session_id}: failed to send evaluation update: {str(e)}")
+
+    if final_evaluation_incremental():
+        # The fold is a further LLM call; only the final report waits for it
+        fold = session.update_summary(
+            llm_service, idx, evaluation.feedback, evaluation_config.get("summary_max_words", 150)
+        )
+        session.track_summary(idx, asyncio.create_task(fold))
+
+def record_answer(
+    session: InterviewSession, transcript: str, response_time: Optional[float] = None
+) -> asyncio.Task:
+    """
+    Store an answer with provisional scores, start its LLM evaluation and advance the session.
+
+    Returns:
+        The background evaluation task, also tracked on the session
+    """
+    idx = session.current_question_index
+    question = session.questions[idx]
+    session.answers.append(transcript)
+    session.evaluations.append(evaluator_service.quick_evaluate(transcript, response_time))
+    task = asyncio.create_task(refine_evaluation(session, idx, question, transcript))
+    session.track_evaluation(idx, task)
+    session.current_question_index += 1
+    return task
+
+async def process_answer(
+    websocket: WebSocket, session_id: str, transcript: str, response_time: Optional[float] = None
+):
     try:
         session = active_sessions[session_id]
         idx = session.current_question_index
-        question = session.questions[idx]
-        transcript = await transcribe_audio(audio_data)
         await websocket.send_json({"type": "transcription", "text": transcript})
 
-        # Always pass the transcript to the LLM for evaluation
-        eval_result = await evaluate_answer(question, transcript, session.visa_type.value)
-        # Ensure field names match
-        if "fluency" in eval_result:
-            eval_result["fluency_score"] = eval_result.pop("fluency")
-        if "confidence" in eval_result:
-            eval_result["confidence_score"] = eval_result.pop("confidence")
-        if "content_accuracy" in eval_result:
-            eval_result["content_accuracy_score"] = eval_result.pop("content_accuracy")
-        if "clarity" in eval_result:
-            eval_result["clarity_score"] = eval_result.pop("clarity")
-        if "response_time" in eval_result:
-            eval_result["response_time_score"] = eval_result.pop("response_time")
-        evaluation = AnswerEvaluation(**eval_result)
-        session.answers.append(transcript)
-        session.evaluations.append(evaluation)
-        session.current_question_index += 1
-        await asyncio.sleep(1)
+        evaluation_task = record_answer(session, transcript, response_time)
         if session.current_question_index >= len(session.questions):
-            final_eval = await session.generate_final_evaluation(llm_service)
+            question_prefetcher.cancel(session_id)
+            on_partial = create_final_evaluation_streamer(websocket) if evaluation_config.get("stream_final", True) else None
+            final_eval = await session.generate_final_evaluation(
+                llm_service, incremental=final_evaluation_incremental(), on_partial=on_partial
+            )
             await websocket.send_json({
                 "type": "interview_complete",
                 "evaluation": final_eval.dict(),
-                "last_evaluation": evaluation.dict()
+                "last_evaluation": session.evaluations[idx].dict()
             })
         else:
+            # The next question's audio is fetched while the answer is being evaluated
             next_q = session.questions[session.current_question_index]
-            audio_url = await tts_service.synthesize(next_q, session.voice_id)
+            audio_url = await question_prefetcher.get_audio_url(
+                session_id, session.current_question_index, next_q, session.voice_id
+            )
+            session.audio_urls.append(audio_url)
+            if evaluation_config.get("mode", "two_phase") != "two_phase":
+                await evaluation_task
             await websocket.send_json({
                 "type": "next_question",
                 "question_text": next_q,
                 "audio_url": audio_url,
                 "question_index": session.current_question_index + 1,
                 "total_questions": len(session.questions),
-                "last_evaluation": evaluation.dict()
+                "last_evaluation": session.evaluations[idx].dict()
             })
     except Exception as e:
         logger.error(f"Error processing answer: {str(e)}")
@@ -1,7 +1,20 @@
+import asyncio
+import logging
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Awaitable
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+# Final evaluation criteria and the AnswerEvaluation fields they average
+SCORE_FIELDS = {
+    "fluency": "fluency_score",
+    "confidence": "confidence_score",
+    "content_accuracy": "content_accuracy_score",
+    "clarity": "clarity_score",
+    "response_time": "response_time_score",
+}
 
 
 class VisaType(str, Enum):
@@ -30,6 +43,7 @@ class StartInterviewRequest(BaseModel):
     visa_type: VisaType
     subscription_level: SubscriptionLevel
     voice_id: str
+    language: Optional[str] = None
 
 
 class StartInterviewResponse(BaseModel):
@@ -55,6 +69,7 @@ class AnswerEvaluation(BaseModel):
     clarity_score: int
     response_time_score: int
     feedback: str = ""
+    provisional: bool = False
 
 
 class EvaluationResult(BaseModel):
@@ -66,6 +81,14 @@ class EvaluationResult(BaseModel):
     areas_to_improve: List[str]
 
 
+class SessionEvaluationsResponse(BaseModel):
+    """Response model for polling a session's answer evaluations"""
+    session_id: str
+    evaluations: List[AnswerEvaluation]
+    pending: List[int]
+    session_complete: bool
+
+
 class SubmitAnswerResponse(BaseModel):
     """Response model for submitting an answer"""
     session_complete: bool
@@ -83,38 +106,135 @@ class InterviewSession(BaseModel):
     visa_type: VisaType
     subscription_level: SubscriptionLevel
     voice_id: str
+    language: Optional[str] = None
     questions: List[str]
     current_question_index: int = 0
     answers: List[str] = Field(default_factory=list)
     evaluations: List[AnswerEvaluation] = Field(default_factory=list)
+    audio_urls: List[str] = Field(default_factory=list)
+    # Maintained as answers are evaluated so the final report does not need the full transcript
+    rolling_summary: str = ""
+    score_totals: Dict[str, float] = Field(default_factory=dict)
+    scored_answers: int = 0
+
+    # Background LLM evaluations and rolling summary folds by answer index
+    _evaluation_tasks: Dict[int, asyncio.Task] = PrivateAttr(default_factory=dict)
+    _summary_tasks: Dict[int, asyncio.Task] = PrivateAttr(default_factory=dict)
+    _summary_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+
+    def track_evaluation(self, index: int, task: asyncio.Task) -> None:
+        """Register the background evaluation of an answer"""
+        self._evaluation_tasks[index] = task
+        task.add_done_callback(lambda _: self._evaluation_tasks.pop(index, None))
+
+    def pending_evaluations(self) -> List[int]:
+        """Return the indices of answers whose evaluation is still running"""
+        return sorted(self._evaluation_tasks)
+
+    async def wait_for_evaluations(self) -> None:
+        """Wait until every answer has been evaluated"""
+        tasks = list(self._evaluation_tasks.values())
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Session {self.session_id}: answer evaluation failed: {str(result)}")
+
+    def track_summary(self, index: int, task: asyncio.Task) -> None:
+        """Register the background fold of an evaluated answer into the rolling summary"""
+        self._summary_tasks[index] = task
+        task.add_done_callback(lambda _: self._summary_tasks.pop(index, None))
+
+    async def wait_for_summaries(self) -> None:
+        """Wait for the answers still being folded into the rolling summary"""
+        tasks = list(self._summary_tasks.values())
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Session {self.session_id}: summary update failed: {str(result)}")
+
+    def record_evaluation(self, index: int, evaluation: AnswerEvaluation) -> None:
+        """Store the final evaluation of an answer and add it to the running score totals"""
+        self.evaluations[index] = evaluation
+        for name, field in SCORE_FIELDS.items():
+            self.score_totals[name] = self.score_totals.get(name, 0.0) + getattr(evaluation, field)
+        self.scored_answers += 1
+
+    def average_scores(self) -> Dict[str, float]:
+        """Return the average score per criterion, preferring the running totals"""
+        if self.scored_answers:
+            return {name: total / self.scored_answers for name, total in self.score_totals.items()}
+        if self.evaluations:
+            return {
+                name: sum(getattr(e, field) for e in self.evaluations) / len(self.evaluations)
+                for name, field in SCORE_FIELDS.items()
+            }
+        return {}
 
-    async def generate_final_evaluation(self, llm_service) -> EvaluationResult:
+    async def update_summary(
+        self, llm_service, index: int, feedback: str, max_words: int = 150
+    ) -> None:
+        """
+        Fold an evaluated answer into the rolling summary.
+
+        Args:
+            llm_service: The LLM service used to rewrite the summary
+            index: Index of the answer
+            feedback: Feedback from the answer's evaluation
+            max_words: Upper bound on the summary length
+        """
+        # Answers are evaluated concurrently but must be folded in one at a time
+        async with self._summary_lock:
+            question, answer = self.questions[index], self.answers[index]
+            try:
+                self.rolling_summary = await llm_service.update_summary(
+                    self.rolling_summary, index + 1, question, answer, feedback,
+                    self.visa_type.value, max_words
+                )
+            except Exception as e:
+                logger.warning(f"Session {self.session_id}: failed to update summary: {str(e)}")
+                # Keep a short note so the answer still reaches the final evaluation
+                self.rolling_summary = f"{self.rolling_summary}\nQ{index + 1}: {question} A: {answer[:200]}".strip()
+
+    async def generate_final_evaluation(
+        self,
+        llm_service,
+        incremental: bool = False,
+        on_partial: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> EvaluationResult:
         """
         Generate a final evaluation for this session using the LLM service.
 
         Args:
             llm_service: The LLM service to use for evaluation
+            incremental: Synthesize from the rolling summary instead of every Q&A pair
+            on_partial: Coroutine called with the partially generated evaluation while streaming
 
         Returns:
             Final evaluation result
         """
-        # Call LLM service to generate comprehensive evaluation
-        eval_data = await llm_service.generate_final_evaluation(
-            questions=self.questions[:len(self.answers)],
-            answers=self.answers,
-            visa_type=self.visa_type.value
-        )
-
-        # Calculate average scores from individual evaluations if available
-        if self.evaluations:
-            avg_scores = {
-                "fluency": sum(e.fluency_score for e in self.evaluations) / len(self.evaluations),
-                "confidence": sum(e.confidence_score for e in self.evaluations) / len(self.evaluations),
-                "content_accuracy": sum(e.content_accuracy_score for e in self.evaluations) / len(self.evaluations),
-                "clarity": sum(e.clarity_score for e in self.evaluations) / len(self.evaluations),
-                "response_time": sum(e.response_time_score for e in self.evaluations) / len(self.evaluations),
-            }
+        # The averages below must use the finished evaluations
+        await self.wait_for_evaluations()
+        avg_scores = self.average_scores()
+        if incremental:
+            # Folds run behind the evaluations; only those not yet finished hold up the report
+            await self.wait_for_summaries()
+
+        if incremental and self.rolling_summary:
+            eval_data = await llm_service.generate_final_evaluation_from_summary(
+                summary=self.rolling_summary,
+                average_scores=avg_scores,
+                answer_count=len(self.answers),
+                visa_type=self.visa_type.value,
+                on_partial=on_partial
+            )
         else:
+            # Call LLM service to generate comprehensive evaluation
+            eval_data = await llm_service.generate_final_evaluation(
+                questions=self.questions[:len(self.answers)],
+                answers=self.answers,
+                visa_type=self.visa_type.value,
+                on_partial=on_partial
+            )
+
+        if not avg_scores:
             # Use scores from LLM evaluation if no individual evaluations
             avg_scores = eval_data.get("detailed_scores", {})
 
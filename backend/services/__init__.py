@@ -1,9 +1,12 @@
 import os
+import time
 import logging
 import yaml
 from typing import Dict, Any
 
 from .llm import LLMService
+from .llm_clients import llm_clients
+from .evaluation import evaluation_cache
 from .tts import TTSService
 from .rag import RAGPipeline
 
@@ -11,11 +14,15 @@ logger = logging.getLogger(__name__)
 
 def load_config() -> Dict[str, Any]:
     """Load configuration file from appropriate location."""
-    # Try to find config.yaml in various locations
+    # Try to find config.yaml in various locations; the repository ships it as config.YAML
     possible_locations = [
-        os.path.join(os.getcwd(), "config.yaml"),
-        os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml"),
-        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config.yaml"),
+        os.path.join(directory, name)
+        for directory in (
+            os.getcwd(),
+            os.path.dirname(os.path.dirname(__file__)),
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        )
+        for name in ("config.yaml", "config.YAML")
     ]
     
     for location in possible_locations:
@@ -29,7 +36,11 @@ def load_config() -> Dict[str, Any]:
         "mistral": {
             "api_key": os.environ.get("MISTRAL_API_KEY", ""),
             "api_url": "https://api.mistral.ai/v1/chat/completions",
-            "model": "mistral-large-latest"
+            "model": "mistral-large-latest",
+            "max_tokens": 1024,
+            "timeout_sec": 120,
+            "max_retries": 5,
+            "max_concurrent_requests": 64
         },
         "edge_tts": {
             "output_dir": "audio_output",
@@ -37,43 +48,137 @@ def load_config() -> Dict[str, Any]:
             "audio_format": "mp3",
             "rate": "+0%",
             "volume": "+0%",
+            "max_concurrency": 8,
+            "prefetch_concurrency": 3,
+            "prefetch_ttl_sec": 1800,
+            "stream_chunk_size": 16384,
+            "voice_catalogue_ttl_sec": 3600,
+            "voice_catalogue_retry_sec": 60,
             "voice_options": [
                 "en-US-AriaNeural",
                 "en-US-GuyNeural",
                 "en-GB-SoniaNeural",
                 "en-AU-NatashaNeural"
-            ]
+            ],
+            "cache": {
+                "enabled": True,
+                "max_entries": 500,
+                "index_path": "data/tts_cache_index.json",
+                "flush_interval_sec": 5
+            },
+            "retention": {
+                "max_bytes": 512 * 1024 * 1024,
+                "max_files": 5000,
+                "max_age_sec": 7 * 24 * 3600,
+                "partial_max_age_sec": 600,
+                "interval_sec": 300
+            }
         },
         "rag": {
             "persist_directory": "data/chroma_db",
             "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
             "chunk_size": 1000,
-            "chunk_overlap": 0
+            "chunk_overlap": 0,
+            "workers": 2,
+            "lazy_load": True,
+            "warmup_wait_sec": 30,
+            "embedding_cache": {
+                "enabled": True,
+                "directory": "data/embedding_cache",
+                "initial_capacity": 1024
+            },
+            "selection": {
+                "strategy": "mmr",
+                "diversity": 0.3,
+                "candidate_pool": 64,
+                "temperature": 0.05
+            }
         },
         "answers": {
             "max_duration_sec": 60,
-            "silence_threshold": 300,
-            "min_answer_length": 10
+            "max_buffer_bytes": 8 * 1024 * 1024,
+            "spill_threshold_bytes": 1024 * 1024,
+            "initial_buffer_bytes": 64 * 1024,
+            "silence_threshold": 50,
+            "vad_min_speech_frames": 10,
+            "vad_frame_ms": 30,
+            "vad_aggressiveness": 3,
+            "vad_boundary_frames": 10,
+            "trim_silence": True,
+            "trim_padding_ms": 150,
+            "max_pause_ms": 600,
+            "decode": {
+                "enabled": True,
+                "streaming": True,
+                "ffmpeg_path": "ffmpeg",
+                "sample_rate": 16000,
+                "workers": 2,
+                "timeout_sec": 20,
+                "upload_format": "flac"
+            },
+            "min_answer_length": 10,
+            "incremental_asr": {
+                "enabled": True,
+                "min_segment_bytes": 40000,
+                "max_segment_bytes": 160000,
+                "overlap_ms": 500
+            }
+        },
+        "evaluation": {
+            "mode": "two_phase",
+            "final_mode": "incremental",
+            "summary_max_words": 150,
+            "stream_final": True,
+            "cache": {
+                "enabled": True,
+                "max_entries": 5000,
+                "ttl_sec": 7 * 24 * 3600,
+                "sqlite_path": "data/evaluation_cache.sqlite3"
+            }
         },
         "subscription": {
             "free": {"max_questions": 5, "feature_set": "basic"},
             "super": {"max_questions": 10, "feature_set": "standard"},
             "premium": {"max_questions": 15, "feature_set": "advanced"}
         },
+        "asr": {
+            "backend": "groq",
+            "max_concurrency": 8,
+            "latency_window": 500,
+            "batch": {"enabled": False, "window_ms": 20, "max_batch_size": 8},
+            "fake": {"delay_sec": 0.2, "language": "en"},
+            "local_file": {"directory": "data/transcripts", "record_audio": False}
+        },
         "groq_whisper": {
             "api_key": os.environ.get("GROQ_API_KEY", ""),
             "endpoint": "https://api.groq.com/openai/v1/audio/transcriptions",
-            "model": "whisper-large-v3-turbo"
+            "model": "whisper-large-v3-turbo",
+            "timeout_sec": 30,
+            "max_retries": 3,
+            "max_connections": 20,
+            "max_keepalive_connections": 10
         }
     }
 
 def initialize_services():
     """Initialize and return all required services."""
+    started = time.monotonic()
     config = load_config()
     
-    # Create services
+    # Create services; in lazy mode the RAG pipeline loads its models during warm-up
+    phase_started = time.monotonic()
+    llm_clients.configure(config["mistral"])
     llm_service = LLMService(config["mistral"])
+    evaluation_cache.configure(config.get("evaluation", {}).get("cache", {}))
+    logger.info(f"LLM service initialized in {time.monotonic() - phase_started:.2f}s")
+
+    phase_started = time.monotonic()
     tts_service = TTSService(config["edge_tts"])
+    logger.info(f"TTS service initialized in {time.monotonic() - phase_started:.2f}s")
+
+    phase_started = time.monotonic()
     rag_pipeline = RAGPipeline()
-    
+    logger.info(f"RAG pipeline initialized in {time.monotonic() - phase_started:.2f}s")
+
+    logger.info(f"Services initialized in {time.monotonic() - started:.2f}s")
     return config, llm_service, tts_service, rag_pipeline
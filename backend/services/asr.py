@@ -1,11 +1,16 @@
+import abc
 import logging
 import os
-import tempfile
-from typing import Dict, Any, Optional
+import time
+import hashlib
+from collections import deque
+from typing import Dict, Any, List, NamedTuple, Optional, Union
 import asyncio
 import httpx
 import yaml
 
+from .audio_buffer import MemoryviewReader
+
 logger = logging.getLogger(__name__)
 
 # Load configuration
@@ -20,113 +25,511 @@ else:
             config = yaml.safe_load(f)
     except Exception as e:
         logger.error(f"Failed to load config: {e}")
-        config = {"groq_whisper": {"api_key": "", "endpoint": "https://api.groq.com/openai/v1/audio/transcriptions"}}
+        config = {
+            "groq_whisper": {"api_key": "", "endpoint": "https://api.groq.com/openai/v1/audio/transcriptions"},
+            "asr": {"backend": "groq"}
+        }
+
+# HTTP/2 needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class TranscriptionError(Exception):
+    """Raised when an ASR backend cannot produce a transcript"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class Transcription(NamedTuple):
+    """Transcript text and the language it was spoken in, when known"""
+    text: str
+    language: Optional[str] = None
+
+
+# Whisper reports detected languages by name; requests take ISO-639-1 codes
+WHISPER_LANGUAGE_CODES = {
+    "english": "en", "hindi": "hi", "spanish": "es", "french": "fr", "german": "de",
+    "chinese": "zh", "japanese": "ja", "korean": "ko", "portuguese": "pt", "russian": "ru",
+    "arabic": "ar", "italian": "it", "turkish": "tr", "vietnamese": "vi", "indonesian": "id",
+    "bengali": "bn", "urdu": "ur", "tamil": "ta", "telugu": "te", "marathi": "mr",
+    "gujarati": "gu", "punjabi": "pa", "nepali": "ne", "kannada": "kn", "malayalam": "ml",
+    "dutch": "nl", "polish": "pl", "persian": "fa", "thai": "th", "tagalog": "tl",
+    "swahili": "sw", "ukrainian": "uk", "filipino": "tl",
+}
+
 
-# Get the API key and endpoint from config
-GROQ_API_KEY = os.environ.get("GROQ_API_KEY", config["groq_whisper"].get("api_key", ""))
-GROQ_ENDPOINT = config["groq_whisper"].get("endpoint", "https://api.groq.com/openai/v1/audio/transcriptions")
+SUPPORTED_LANGUAGE_CODES = set(WHISPER_LANGUAGE_CODES.values())
 
 
-async def transcribe_audio(audio_data: bytes, model: str = "whisper-large-v3", language: Optional[str] = None) -> str:
+def normalize_language(language: Optional[str]) -> Optional[str]:
     """
-    Transcribe audio data using Groq's Whisper API.
-    
+    Convert a Whisper language name, code or locale to an ISO-639-1 code.
+
     Args:
-        audio_data: Raw audio bytes to transcribe
-        model: Model name to use
-        language: Optional language code
-        
+        language: E.g. "english", "en" or "en-US"
+
     Returns:
-        Transcribed text
+        The code, or None if the language is empty or not supported
     """
-    logger.info(f"Transcribing audio of size {len(audio_data)} bytes")
-    temp_file_path = None
-    
-    try:
-        # Check for valid audio data
-        if not audio_data or len(audio_data) < 1000:  # Minimum meaningful audio size
-            logger.warning("Audio data too small to transcribe")
-            return "Audio too short to transcribe."
-        
-        # Create a unique temporary file name
-        temp_file_path = os.path.join(tempfile.gettempdir(), f"{os.urandom(8).hex()}.webm")
-        
-        # Write audio data to the temporary file
-        with open(temp_file_path, "wb") as f:
-            f.write(audio_data)
-        
-        # Prepare the headers with authentication
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}"
+    if not language:
+        return None
+    language = language.strip().lower().replace("_", "-").split("-")[0]
+    if language in SUPPORTED_LANGUAGE_CODES:
+        return language
+    return WHISPER_LANGUAGE_CODES.get(language)
+
+
+class TranscriptionRequest:
+    """One queued transcription call"""
+
+    def __init__(
+        self,
+        audio_data: Union[bytes, memoryview],
+        model: Optional[str] = None,
+        language: Optional[str] = None,
+        filename: str = "audio.webm",
+        content_type: str = "audio/webm"
+    ):
+        self.audio_data = audio_data
+        self.model = model
+        self.language = language
+        self.filename = filename
+        self.content_type = content_type
+
+
+class ASRBackend(abc.ABC):
+    """Base class for speech-to-text backends"""
+
+    name = "base"
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize shared concurrency limits and latency metrics"""
+        self.default_model = config.get("model", "whisper-large-v3")
+        self._semaphore = asyncio.Semaphore(max(1, config.get("max_concurrency", 8)))
+        self._latencies: deque = deque(maxlen=config.get("latency_window", 500))
+        self.stats: Dict[str, Any] = {"requests": 0, "errors": 0, "batches": 0, "audio_bytes": 0}
+
+    async def transcribe(self, request: TranscriptionRequest) -> Transcription:
+        """
+        Transcribe one request, recording latency.
+
+        Args:
+            request: Audio and parameters to transcribe
+
+        Returns:
+            Transcript and detected language
+
+        Raises:
+            TranscriptionError: If the backend cannot produce a transcript
+        """
+        started = time.monotonic()
+        self.stats["requests"] += 1
+        self.stats["audio_bytes"] += len(request.audio_data)
+        try:
+            async with self._semaphore:
+                return await self._transcribe(request)
+        except Exception as e:
+            self.stats["errors"] += 1
+            if isinstance(e, TranscriptionError):
+                raise
+            raise TranscriptionError(str(e)) from e
+        finally:
+            self._latencies.append(time.monotonic() - started)
+
+    async def transcribe_batch(self, requests: List[TranscriptionRequest]) -> List[Union[Transcription, Exception]]:
+        """
+        Transcribe several requests together.
+
+        Args:
+            requests: Requests collected by the micro-batcher
+
+        Returns:
+            Transcript or exception for each request, in order
+        """
+        self.stats["batches"] += 1
+        return await asyncio.gather(*(self.transcribe(r) for r in requests), return_exceptions=True)
+
+    @abc.abstractmethod
+    async def _transcribe(self, request: TranscriptionRequest) -> Transcription:
+        """Send one request to the backend"""
+
+    async def aclose(self) -> None:
+        """Release backend resources"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return request counts and latency percentiles"""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            "backend": self.name,
+            **self.stats,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
         }
-        
-        # Make the API request with retry mechanism
-        max_retries = 3
+
+
+class GroqASRBackend(ASRBackend):
+    """Groq's Whisper API over one pooled keep-alive connection"""
+
+    name = "groq"
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the backend with the groq_whisper configuration"""
+        super().__init__(config)
+        self.api_key = os.environ.get("GROQ_API_KEY", config.get("api_key", ""))
+        self.endpoint = config.get("endpoint", "https://api.groq.com/openai/v1/audio/transcriptions")
+        self.timeout = config.get("timeout_sec", 30.0)
+        self.max_retries = config.get("max_retries", 3)
+        self.limits = httpx.Limits(
+            max_connections=config.get("max_connections", 20),
+            max_keepalive_connections=config.get("max_keepalive_connections", 10),
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared HTTP client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+        return self._client
+
+    async def _transcribe(self, request: TranscriptionRequest) -> Transcription:
+        """Upload the audio to Groq, retrying transient failures"""
+        # Additional parameters; without a pinned language ask for the detected one
+        data = {
+            'model': request.model or self.default_model,
+            'response_format': 'json' if request.language else 'verbose_json'
+        }
+        if request.language:
+            data['language'] = request.language
+
+        # Make the API request with retry mechanism, uploading straight from memory
         retry_count = 0
-        
-        while retry_count < max_retries:
+        while True:
             try:
-                # Open the file in a new context for each request attempt
-                with open(temp_file_path, 'rb') as audio_file:
-                    files = {
-                        'file': ('audio.webm', audio_file, 'audio/webm')
-                    }
-                    
-                    # Additional parameters
-                    data = {
-                        'model': model, 
-                        'response_format': 'json'
-                    }
-                    
-                    if language:
-                        data['language'] = language
-                    
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        response = await client.post(
-                            GROQ_ENDPOINT,
-                            headers=headers,
-                            files=files,
-                            data=data
-                        )
-                
-                # Break the loop if successful
+                # Buffer views are streamed through a reader instead of copied
+                audio_data = request.audio_data
+                upload = MemoryviewReader(audio_data) if isinstance(audio_data, memoryview) else audio_data
+                response = await self.client.post(
+                    self.endpoint,
+                    files={'file': (request.filename, upload, request.content_type)},
+                    data=data
+                )
                 break
             except Exception as e:
                 retry_count += 1
-                logger.warning(f"Transcription retry {retry_count}/{max_retries}: {str(e)}")
-                if retry_count >= max_retries:
-                    raise
+                logger.warning(f"Transcription retry {retry_count}/{self.max_retries}: {str(e)}")
+                if retry_count >= self.max_retries:
+                    raise TranscriptionError(str(e)) from e
                 await asyncio.sleep(1)  # Wait before retry
-        
+
         # Check if the request was successful
-        if response.status_code == 200:
-            result = response.json()
-            transcript = result.get('text', '')
-            
-            # Trim and clean up transcript
-            transcript = transcript.strip()
-            
-            logger.info(f"Transcription successful: {transcript[:50]}...")
-            return transcript
-        else:
+        if response.status_code != 200:
             logger.error(f"Error in transcription API: {response.status_code} - {response.text}")
-            return f"Error transcribing audio (HTTP {response.status_code})."
+            raise TranscriptionError(response.text, status_code=response.status_code)
+
+        result = response.json()
+
+        # Trim and clean up transcript
+        transcript = result.get('text', '').strip()
+
+        logger.info(f"Transcription successful: {transcript[:50]}...")
+        return Transcription(transcript, request.language or normalize_language(result.get('language')))
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+
+
+class FakeASRBackend(ASRBackend):
+    """Deterministic, network-free backend for benchmarks and local development"""
+
+    name = "fake"
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the backend with canned transcripts and a simulated delay"""
+        super().__init__(config)
+        self.delay_sec = config.get("delay_sec", 0.2)
+        self.language = config.get("language", "en")
+        self.transcripts = config.get("transcripts") or [
+            "I am travelling for tourism and will stay for two weeks.",
+            "My parents are paying for my trip and my studies.",
+            "I will return home after graduation to work in my family's business.",
+        ]
+
+    async def _transcribe(self, request: TranscriptionRequest) -> Transcription:
+        await asyncio.sleep(self.delay_sec)
+        return Transcription(self._pick(request), request.language or self.language)
+
+    async def transcribe_batch(self, requests: List[TranscriptionRequest]) -> List[Union[Transcription, Exception]]:
+        """Answer a whole batch after a single delay, like a batched inference server"""
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(requests)
+        started = time.monotonic()
+        await asyncio.sleep(self.delay_sec)
+        latency = time.monotonic() - started
+        results = []
+        for request in requests:
+            self.stats["audio_bytes"] += len(request.audio_data)
+            self._latencies.append(latency)
+            results.append(Transcription(self._pick(request), request.language or self.language))
+        return results
+
+    def _pick(self, request: TranscriptionRequest) -> str:
+        """Choose a transcript from a hash of the audio so results are reproducible"""
+        digest = hashlib.sha256(request.audio_data).digest()
+        return self.transcripts[int.from_bytes(digest[:4], "big") % len(self.transcripts)]
+
+
+class LocalFileASRBackend(ASRBackend):
+    """Serves transcripts from files named by the SHA-256 of the audio"""
+
+    name = "local_file"
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the backend with its transcript directory"""
+        super().__init__(config)
+        self.directory = config.get("directory", "data/transcripts")
+        self.record_audio = config.get("record_audio", False)
+        os.makedirs(self.directory, exist_ok=True)
+
+    async def _transcribe(self, request: TranscriptionRequest) -> Transcription:
+        digest = hashlib.sha256(request.audio_data).hexdigest()
+        if self.record_audio:
+            # Keep unknown audio so a transcript can be written for it later
+            extension = os.path.splitext(request.filename)[1] or ".bin"
+            audio_path = os.path.join(self.directory, f"{digest}{extension}")
+            if not os.path.exists(audio_path):
+                await asyncio.to_thread(self._write, audio_path, request.audio_data)
+        transcript_path = os.path.join(self.directory, f"{digest}.txt")
+        try:
+            text = (await asyncio.to_thread(self._read, transcript_path)).strip()
+            return Transcription(text, request.language)
+        except FileNotFoundError:
+            raise TranscriptionError(f"No transcript for audio {digest}")
+
+    @staticmethod
+    def _read(path: str) -> str:
+        with open(path) as f:
+            return f.read()
+
+    @staticmethod
+    def _write(path: str, data) -> None:
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+class MicroBatcher:
+    """Collects transcription requests for a short window and dispatches them together"""
+
+    def __init__(self, backend: ASRBackend, config: Dict[str, Any]):
+        """Initialize the batcher with its window and batch size"""
+        self.backend = backend
+        self.window_sec = config.get("window_ms", 20) / 1000
+        self.max_batch_size = max(1, config.get("max_batch_size", 8))
+        self._pending: List[tuple] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def submit(self, request: TranscriptionRequest) -> Transcription:
+        """
+        Queue a request and wait for its transcript.
+
+        Args:
+            request: Audio and parameters to transcribe
+
+        Returns:
+            Transcript and detected language
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((request, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window_sec)
+        self._flush_task = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Send everything queued so far as one batch"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.create_task(self._run(batch))
+
+    async def _run(self, batch: List[tuple]) -> None:
+        results = await self.backend.transcribe_batch([request for request, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+ASR_BACKENDS = {
+    "groq": GroqASRBackend,
+    "fake": FakeASRBackend,
+    "local_file": LocalFileASRBackend,
+}
+
+
+class ASRService:
+    """Service for speech-to-text through the configured backend"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the service and its backend from the full configuration"""
+        asr_config = config.get("asr", {})
+        backend_name = asr_config.get("backend", "groq")
+        if backend_name not in ASR_BACKENDS:
+            raise ValueError(f"Unknown ASR backend: {backend_name}")
+
+        # Groq settings live in their own section; other backends in asr.<name>
+        if backend_name == "groq":
+            backend_config = {**asr_config, **config.get("groq_whisper", {})}
+        else:
+            backend_config = {**asr_config, **asr_config.get(backend_name, {})}
+        self.backend = ASR_BACKENDS[backend_name](backend_config)
+
+        batch_config = asr_config.get("batch", {})
+        self.batcher = MicroBatcher(self.backend, batch_config) if batch_config.get("enabled", False) else None
+        logger.info(f"Using {backend_name} ASR backend")
+
+    async def transcribe_detailed(
+        self,
+        audio_data: Union[bytes, memoryview],
+        model: Optional[str] = None,
+        language: Optional[str] = None,
+        filename: str = "audio.webm",
+        content_type: str = "audio/webm"
+    ) -> Transcription:
+        """
+        Transcribe audio data and report the spoken language.
+
+        Args:
+            audio_data: Raw audio bytes or a buffer view to transcribe
+            model: Model name to use, or the backend default
+            language: Optional language code; detected when omitted
+            filename: Filename reported in the upload
+            content_type: MIME type of the audio
+
+        Returns:
+            Transcript and language code (None if the backend cannot tell)
+
+        Raises:
+            TranscriptionError: If the backend cannot produce a transcript
+        """
+        request = TranscriptionRequest(audio_data, model, language, filename, content_type)
+        if self.batcher:
+            return await self.batcher.submit(request)
+        return await self.backend.transcribe(request)
+
+    async def transcribe(
+        self,
+        audio_data: Union[bytes, memoryview],
+        model: Optional[str] = None,
+        language: Optional[str] = None,
+        filename: str = "audio.webm",
+        content_type: str = "audio/webm"
+    ) -> Transcription:
+        """
+        Transcribe audio data, returning a user-facing message on failure.
+
+        Args:
+            audio_data: Raw audio bytes or a buffer view to transcribe
+            model: Model name to use, or the backend default
+            language: Optional language code; detected when omitted
+            filename: Filename reported in the upload
+            content_type: MIME type of the audio
+
+        Returns:
+            Transcript and detected language; the text is an error message on failure
+        """
+        logger.info(f"Transcribing audio of size {len(audio_data)} bytes")
+
+        # Check for valid audio data
+        if not audio_data or len(audio_data) < 1000:  # Minimum meaningful audio size
+            logger.warning("Audio data too small to transcribe")
+            return Transcription("Audio too short to transcribe.", language)
+
+        try:
+            return await self.transcribe_detailed(
+                audio_data, model=model, language=language, filename=filename, content_type=content_type
+            )
+        except TranscriptionError as e:
+            if e.status_code is not None:
+                return Transcription(f"Error transcribing audio (HTTP {e.status_code}).", language)
+            logger.error(f"Exception during transcription: {str(e)}")
+            return Transcription("Error processing audio.", language)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return backend latency and request statistics"""
+        return self.backend.get_stats()
+
+    async def aclose(self) -> None:
+        """Release backend resources"""
+        await self.backend.aclose()
+
+
+# Shared service reused across sessions for the lifetime of the app
+asr_service = ASRService(config)
+
+
+async def transcribe_audio(
+    audio_data: Union[bytes, memoryview],
+    model: Optional[str] = None,
+    language: Optional[str] = None,
+    filename: str = "audio.webm",
+    content_type: str = "audio/webm"
+) -> str:
+    """
+    Transcribe audio data using the configured ASR backend.
     
-    except Exception as e:
-        logger.error(f"Exception during transcription: {str(e)}")
-        return "Error processing audio."
-    finally:
-        # Clean up the temporary file in the finally block
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except Exception as e:
-                logger.warning(f"Failed to delete temporary file: {str(e)}")
+    Args:
+        audio_data: Raw audio bytes or a buffer view to transcribe
+        model: Model name to use, or the backend default
+        language: Optional language code
+        filename: Filename reported in the upload
+        content_type: MIME type of the audio
+        
+    Returns:
+        Transcribed text
+    """
+    result = await asr_service.transcribe(
+        audio_data, model=model, language=language, filename=filename, content_type=content_type
+    )
+    return result.text
 
 
 async def transcribe_file(
     audio_path: str,
-    model: str = "large-v3-turbo",
+    model: Optional[str] = None,
     language: Optional[str] = None
 ) -> Dict[str, Any]:
     """
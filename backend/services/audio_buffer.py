@@ -0,0 +1,158 @@
+import io
+import mmap
+import time
+import logging
+import tempfile
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AudioBufferFull(Exception):
+    """Raised when an append would exceed the buffer's byte or duration cap"""
+
+
+class AudioBuffer:
+    """Bounded per-session answer buffer that spills to a temp file above a threshold"""
+
+    def __init__(self, config: Dict[str, Any], bytes_per_second: Optional[int] = None):
+        """
+        Initialize the buffer.
+
+        Args:
+            config: Answer processing configuration
+            bytes_per_second: Byte rate for raw PCM; wall-clock time is used when unknown
+        """
+        self.max_bytes = config.get("max_buffer_bytes", 8 * 1024 * 1024)
+        self.max_duration_sec = config.get("max_duration_sec", 60)
+        self.spill_threshold = config.get("spill_threshold_bytes", 1024 * 1024)
+        self.initial_capacity = config.get("initial_buffer_bytes", 64 * 1024)
+        self.bytes_per_second = bytes_per_second
+
+        self._buf = bytearray(self.initial_capacity)
+        self._size = 0
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._started_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the audio lives in a temp file rather than memory"""
+        return self._file is not None
+
+    @property
+    def duration_sec(self) -> float:
+        """Duration of the buffered audio"""
+        if self.bytes_per_second:
+            return self._size / self.bytes_per_second
+        if self._started_at is None:
+            return 0.0
+        return time.monotonic() - self._started_at
+
+    def append(self, chunk: bytes) -> None:
+        """
+        Append a chunk of audio.
+
+        Args:
+            chunk: Audio bytes received from the client
+
+        Raises:
+            AudioBufferFull: If the chunk would exceed the byte or duration cap
+        """
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        new_size = self._size + len(chunk)
+        if new_size > self.max_bytes:
+            raise AudioBufferFull(f"Answer exceeds {self.max_bytes} bytes")
+        if self.bytes_per_second and new_size / self.bytes_per_second > self.max_duration_sec:
+            raise AudioBufferFull(f"Answer exceeds {self.max_duration_sec} seconds")
+        if not self.bytes_per_second and self.duration_sec > self.max_duration_sec:
+            raise AudioBufferFull(f"Answer exceeds {self.max_duration_sec} seconds")
+
+        if self._file is None and new_size > self.spill_threshold:
+            self._spill()
+
+        if self._file is not None:
+            self._close_mmap()
+            self._file.seek(self._size)
+            self._file.write(chunk)
+        else:
+            if new_size > len(self._buf):
+                # Grow geometrically so appends stay amortized O(1)
+                self._buf.extend(bytes(max(new_size, 2 * len(self._buf)) - len(self._buf)))
+            self._buf[self._size:new_size] = chunk
+        self._size = new_size
+
+    def view(self) -> memoryview:
+        """
+        Return a zero-copy view of the buffered audio.
+
+        The view must be released before the next append or release.
+
+        Returns:
+            Read-only memoryview over the audio bytes
+        """
+        if self._file is None:
+            return memoryview(self._buf)[:self._size].toreadonly()
+        if self._size == 0:
+            return memoryview(b"")
+        if self._mmap is None:
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def release(self) -> None:
+        """Drop the buffered audio and give its memory and temp file back"""
+        self._close_mmap()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buf = bytearray(self.initial_capacity)
+        self._size = 0
+        self._started_at = None
+
+    def _spill(self) -> None:
+        """Move the in-memory audio to an anonymous temp file"""
+        self._file = tempfile.TemporaryFile()
+        self._file.write(memoryview(self._buf)[:self._size])
+        self._buf = bytearray()
+        logger.info(f"Audio buffer spilled to disk at {self._size} bytes")
+
+    def _close_mmap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class MemoryviewReader(io.RawIOBase):
+    """Seekable file-like reader over a memoryview, for streaming uploads without a copy"""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = min(len(b), len(self._view) - self._pos)
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, min(offset, len(self._view)))
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
@@ -0,0 +1,247 @@
+import time
+import shutil
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Union, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_ffmpeg(ffmpeg_path: str, args: List[str], data: bytes, timeout: float) -> bytes:
+    """
+    Pipe data through ffmpeg without blocking the event loop.
+
+    Args:
+        ffmpeg_path: Path to the ffmpeg binary
+        args: Input and output options
+        data: Bytes written to ffmpeg's stdin
+        timeout: Maximum seconds ffmpeg may take
+
+    Returns:
+        Everything ffmpeg wrote to stdout
+
+    Raises:
+        RuntimeError: If ffmpeg exits with an error
+        asyncio.TimeoutError: If ffmpeg does not finish in time
+    """
+    process = await asyncio.create_subprocess_exec(
+        ffmpeg_path, "-hide_banner", "-loglevel", "error", *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(data), timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+        raise
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg exited with status {process.returncode}: {message}")
+    return stdout
+
+
+async def decode_to_pcm(data: bytes, ffmpeg_path: str, sample_rate: int, timeout: float) -> bytes:
+    """
+    Decode compressed audio to 16-bit mono PCM.
+
+    Args:
+        data: Encoded audio (e.g. WebM/Opus from the browser)
+        ffmpeg_path: Path to the ffmpeg binary
+        sample_rate: Target sample rate in Hz
+        timeout: Maximum seconds to spend decoding
+
+    Returns:
+        Little-endian 16-bit mono PCM samples
+    """
+    return await run_ffmpeg(
+        ffmpeg_path,
+        ["-i", "pipe:0", "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+        data, timeout
+    )
+
+
+async def encode_flac(pcm: bytes, ffmpeg_path: str, sample_rate: int, timeout: float) -> bytes:
+    """
+    Encode 16-bit mono PCM as FLAC.
+
+    Args:
+        pcm: Little-endian 16-bit mono PCM samples
+        ffmpeg_path: Path to the ffmpeg binary
+        sample_rate: Sample rate of the PCM in Hz
+        timeout: Maximum seconds to spend encoding
+
+    Returns:
+        FLAC file bytes
+    """
+    return await run_ffmpeg(
+        ffmpeg_path,
+        ["-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-i", "pipe:0", "-f", "flac", "pipe:1"],
+        pcm, timeout
+    )
+
+
+class StreamingDecoder:
+    """Decodes one recording to PCM while it is still being received, with a long-lived ffmpeg process"""
+
+    def __init__(self, ffmpeg_path: str, sample_rate: int, on_pcm: Callable[[bytes], None], read_size: int = 4096):
+        """
+        Initialize the decoder.
+
+        Args:
+            ffmpeg_path: Path to the ffmpeg binary
+            sample_rate: Target sample rate in Hz
+            on_pcm: Called with every piece of decoded 16-bit mono PCM, in order
+            read_size: Maximum bytes read from ffmpeg at a time
+        """
+        self.ffmpeg_path = ffmpeg_path
+        self.sample_rate = sample_rate
+        self.on_pcm = on_pcm
+        self.read_size = read_size
+        self.decoded_bytes = 0
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start ffmpeg; probing is kept minimal so PCM flows after the first Cluster"""
+        self._process = await asyncio.create_subprocess_exec(
+            self.ffmpeg_path, "-hide_banner", "-loglevel", "error",
+            "-fflags", "nobuffer", "-probesize", "32", "-analyzeduration", "0",
+            "-i", "pipe:0",
+            "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(self.sample_rate),
+            "-flush_packets", "1", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader = asyncio.create_task(self._read())
+
+    async def feed(self, chunk: bytes) -> None:
+        """
+        Pass a chunk of the recording to ffmpeg.
+
+        Raises:
+            Exception: If ffmpeg has exited
+        """
+        self._process.stdin.write(chunk)
+        await self._process.stdin.drain()
+
+    async def finish(self, timeout: float) -> None:
+        """
+        Close the input and wait until every decoded sample has been delivered.
+
+        Args:
+            timeout: Maximum seconds to wait for ffmpeg to drain
+
+        Raises:
+            Exception: If ffmpeg failed or did not finish in time
+        """
+        try:
+            self._process.stdin.close()
+            await asyncio.wait_for(asyncio.shield(self._reader), timeout)
+            returncode = await asyncio.wait_for(self._process.wait(), timeout)
+        except BaseException:
+            self.close()
+            raise
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with status {returncode}")
+
+    def close(self) -> None:
+        """Stop ffmpeg without waiting for the rest of the output"""
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+        if self._process is not None and self._process.returncode is None:
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _read(self) -> None:
+        """Deliver decoded PCM as ffmpeg produces it"""
+        while True:
+            data = await self._process.stdout.read(self.read_size)
+            if not data:
+                return
+            self.decoded_bytes += len(data)
+            self.on_pcm(data)
+
+
+class AudioDecoder:
+    """Decodes answer audio to 16 kHz mono PCM with ffmpeg subprocesses, off the event loop"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the decoder with configuration"""
+        self.sample_rate = config.get("sample_rate", 16000)
+        self.max_processes = config.get("workers", 2)
+        self.timeout = config.get("timeout_sec", 20.0)
+        self.ffmpeg_path = shutil.which(config.get("ffmpeg_path", "ffmpeg"))
+        # Bounds the ffmpeg processes decoding or encoding whole answers at once
+        self._slots = asyncio.Semaphore(max(1, self.max_processes))
+        self.stats: Dict[str, Any] = {"decoded": 0, "failed": 0, "decode_time_total": 0.0, "streams": 0}
+
+        if self.ffmpeg_path is None:
+            logger.warning("ffmpeg not found; compressed answer audio will not be decoded")
+
+    @property
+    def available(self) -> bool:
+        """Whether decoding is possible on this host"""
+        return self.ffmpeg_path is not None
+
+    @property
+    def bytes_per_second(self) -> int:
+        """Byte rate of the decoded PCM"""
+        return self.sample_rate * 2
+
+    async def decode(self, audio: Union[bytes, memoryview]) -> bytes:
+        """
+        Decode an answer to PCM without blocking the event loop.
+
+        Args:
+            audio: Encoded answer audio
+
+        Returns:
+            16-bit mono PCM at the configured sample rate
+        """
+        started = time.monotonic()
+        try:
+            pcm = await self._run(decode_to_pcm, bytes(audio), self.ffmpeg_path, self.sample_rate, self.timeout)
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        self.stats["decoded"] += 1
+        self.stats["decode_time_total"] += time.monotonic() - started
+        return pcm
+
+    async def open_stream(self, on_pcm: Callable[[bytes], None]) -> StreamingDecoder:
+        """
+        Start decoding a recording while it is being received.
+
+        Args:
+            on_pcm: Called with the decoded PCM as it becomes available
+
+        Returns:
+            Started streaming decoder
+        """
+        decoder = StreamingDecoder(self.ffmpeg_path, self.sample_rate, on_pcm)
+        await decoder.start()
+        self.stats["streams"] += 1
+        return decoder
+
+    async def encode_flac(self, pcm: Union[bytes, memoryview]) -> bytes:
+        """Encode decoded PCM as FLAC for a compact lossless upload"""
+        return await self._run(encode_flac, bytes(pcm), self.ffmpeg_path, self.sample_rate, self.timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return decoding statistics"""
+        decoded = self.stats["decoded"]
+        return {
+            **self.stats,
+            "available": self.available,
+            "decode_time_avg": self.stats["decode_time_total"] / decoded if decoded else 0.0,
+        }
+
+    async def _run(self, fn, *args):
+        """Run an ffmpeg coroutine once a process slot is free"""
+        async with self._slots:
+            return await fn(*args)
@@ -0,0 +1,405 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Workers of one deployment share the store; fcntl is missing on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.txt"
+VECTORS_FILE = "vectors.f32"
+LOCK_FILE = "lock"
+
+
+class CorruptStoreError(Exception):
+    """Raised when the index of an EmbeddingStore cannot be trusted"""
+
+
+class EmbeddingStore:
+    """Append-only on-disk embeddings of one model: a memory-mapped float32 matrix plus a key index"""
+
+    def __init__(self, directory: str, initial_capacity: int = 1024):
+        """
+        Open or create the store.
+
+        The first line of the index records the vector dimension; every other
+        line is "<key> <row>". Processes sharing the directory take a file lock
+        to grow the matrix or append to the index.
+
+        Args:
+            directory: Directory holding the matrix and the index
+            initial_capacity: Rows allocated when the matrix is created
+        """
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.vectors_path = os.path.join(directory, VECTORS_FILE)
+        self.lock_path = os.path.join(directory, LOCK_FILE)
+
+        self.dim: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self._next_row = 0
+        self._matrix: Optional[np.memmap] = None
+        # How far this process has read the index, and which file it was
+        self._index_offset = 0
+        self._index_inode: Optional[int] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self.refresh()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the store's lock against other processes"""
+        with open(self.lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def refresh(self) -> None:
+        """Pick up rows other processes appended since the index was last read"""
+        with self._locked():
+            self._read_index()
+
+    def _read_index(self) -> None:
+        """Read the index lines appended since the last read; the lock must be held"""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            if self.dim is not None:
+                self._reset()
+            return
+        if stat.st_ino != self._index_inode or stat.st_size < self._index_offset:
+            # Replaced or discarded by another process
+            self._reset()
+            self._index_inode = stat.st_ino
+        if stat.st_size == self._index_offset:
+            return
+
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_offset)
+                data = f.read()
+            self._parse_index(data)
+        except CorruptStoreError as e:
+            logger.warning(f"Discarding corrupt embedding cache at {self.directory}: {str(e)}")
+            self._discard()
+            return
+        self._index_offset += len(data)
+        self._map(self._next_row)
+
+    def _parse_index(self, data: bytes) -> None:
+        """Apply index lines; raises CorruptStoreError on anything malformed"""
+        if not data.endswith(b"\n"):
+            raise CorruptStoreError("index ends in a partial line")
+        lines = data.decode("ascii", errors="replace").split("\n")[:-1]
+        if self._index_offset == 0:
+            header = lines.pop(0)
+            if not header.isdigit() or int(header) == 0:
+                raise CorruptStoreError(f"bad dimension {header!r}")
+            self.dim = int(header)
+
+        capacity = self._capacity()
+        rows: Dict[str, int] = {}
+        for line in lines:
+            key, _, row = line.partition(" ")
+            if len(key) != 64 or not row.isdigit() or int(row) >= capacity:
+                raise CorruptStoreError(f"bad index line {line!r}")
+            rows[key] = int(row)
+        self.rows.update(rows)
+        if rows:
+            self._next_row = max(self._next_row, max(rows.values()) + 1)
+
+    def _capacity(self) -> int:
+        """Rows the matrix file currently holds"""
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dim)
+
+    def _map(self, rows: int) -> None:
+        """Make sure the memory map covers at least rows rows of the file"""
+        if rows == 0 or (self._matrix is not None and self._matrix.shape[0] >= rows):
+            return
+        self._unmap()
+        self._matrix = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r+", shape=(self._capacity(), self.dim)
+        )
+
+    def _unmap(self) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+
+    def _reset(self) -> None:
+        """Forget everything read from the index"""
+        self._unmap()
+        self.dim = None
+        self.rows = {}
+        self._next_row = 0
+        self._index_offset = 0
+        self._index_inode = None
+
+    def _discard(self) -> None:
+        """Delete the store's files; the lock must be held"""
+        self._reset()
+        for path in (self.index_path, self.vectors_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the matrix geometrically so it holds at least rows rows; the lock must be held"""
+        capacity = self._capacity()
+        if rows > capacity:
+            capacity = max(rows, 2 * capacity, self.initial_capacity)
+            self._unmap()
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(capacity * self.dim * 4)
+        self._map(rows)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return a copy of the stored vector, or None"""
+        row = self.rows.get(key)
+        if row is None:
+            return None
+        return np.array(self._matrix[row])
+
+    def put(self, keys: List[str], vectors: np.ndarray) -> int:
+        """
+        Append vectors, skipping keys already stored.
+
+        Args:
+            keys: Keys from EmbeddingCache.make_key
+            vectors: Matching vectors, one row per key
+
+        Returns:
+            Number of vectors appended
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._locked():
+            # Other processes may have appended since; their rows must not be reused
+            self._read_index()
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._write_header()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional embeddings, got {vectors.shape[1]}")
+
+            new_keys, new_rows, seen = [], [], set()
+            for key, vector in zip(keys, vectors):
+                if key not in self.rows and key not in seen:
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_rows.append(vector)
+            if not new_keys:
+                return 0
+
+            start = self._next_row
+            self._reserve(start + len(new_keys))
+            self._matrix[start:start + len(new_keys)] = np.stack(new_rows)
+            # Vectors reach the disk before the index refers to them
+            self._matrix.flush()
+            lines = "".join(f"{key} {start + offset}\n" for offset, key in enumerate(new_keys)).encode("ascii")
+            with open(self.index_path, "ab") as f:
+                f.write(lines)
+            self._index_offset += len(lines)
+            for offset, key in enumerate(new_keys):
+                self.rows[key] = start + offset
+            self._next_row = start + len(new_keys)
+        return len(new_keys)
+
+    def _write_header(self) -> None:
+        """Start a new index and matrix; the lock must be held"""
+        if os.path.exists(self.vectors_path):
+            os.remove(self.vectors_path)
+        header = f"{self.dim}\n".encode("ascii")
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+        os.replace(tmp_path, self.index_path)
+        self._index_inode = os.stat(self.index_path).st_ino
+        self._index_offset = len(header)
+
+    def close(self) -> None:
+        """Flush and release the memory map"""
+        self._unmap()
+
+
+class EmbeddingCache:
+    """Persistent embeddings keyed by a hash of the model name and text"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the cache with configuration"""
+        self.enabled = config.get("enabled", True)
+        self.directory = config.get("directory", "data/embedding_cache")
+        self.initial_capacity = config.get("initial_capacity", 1024)
+
+        # One store per model, since models differ in vector dimension
+        self._stores: Dict[str, Optional[EmbeddingStore]] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0}
+
+    @staticmethod
+    def make_key(model: str, text: str, kind: str = "document") -> str:
+        """
+        Build the cache key for an embedding.
+
+        Args:
+            model: Embedding model name
+            text: Embedded text
+            kind: "document" or "query", since some models embed them differently
+
+        Returns:
+            Hex digest identifying the embedding
+        """
+        payload = "\x00".join([model, kind, text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _store(self, model: str) -> Optional[EmbeddingStore]:
+        if model not in self._stores:
+            directory = os.path.join(self.directory, hashlib.sha256(model.encode("utf-8")).hexdigest()[:16])
+            try:
+                self._stores[model] = EmbeddingStore(directory, self.initial_capacity)
+                logger.info(f"Opened embedding cache for {model} with {len(self._stores[model].rows)} entries")
+            except Exception as e:
+                logger.warning(f"Embedding cache disabled for {model}: {str(e)}")
+                self._stores[model] = None
+        return self._stores[model]
+
+    def get_many(self, model: str, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up embeddings.
+
+        Args:
+            model: Embedding model name
+            keys: Keys from make_key
+
+        Returns:
+            The cached vector or None for every key
+        """
+        if not self.enabled:
+            return [None] * len(keys)
+        with self._lock:
+            store = self._store(model)
+            vectors = [store.get(key) if store else None for key in keys]
+            if store and any(vector is None for vector in vectors):
+                # Another worker may have stored them since this one last read the index
+                try:
+                    store.refresh()
+                    vectors = [store.get(key) if vector is None else vector for key, vector in zip(keys, vectors)]
+                except Exception as e:
+                    logger.warning(f"Failed to refresh embedding cache: {str(e)}")
+        hits = sum(vector is not None for vector in vectors)
+        self.stats["hits"] += hits
+        self.stats["misses"] += len(keys) - hits
+        return vectors
+
+    def put_many(self, model: str, keys: List[str], vectors) -> None:
+        """
+        Store embeddings.
+
+        Args:
+            model: Embedding model name
+            keys: Keys from make_key
+            vectors: Matching vectors
+        """
+        if not self.enabled or not keys:
+            return
+        with self._lock:
+            store = self._store(model)
+            if store is None:
+                return
+            try:
+                self.stats["stores"] += store.put(keys, vectors)
+            except Exception as e:
+                logger.warning(f"Failed to persist embeddings: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": {model: len(store.rows) for model, store in self._stores.items() if store},
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Flush every store"""
+        with self._lock:
+            for store in self._stores.values():
+                if store is not None:
+                    store.close()
+            self._stores = {}
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings that only run the model for texts missing from an EmbeddingCache"""
+
+    def __init__(self, model_name: str, cache: EmbeddingCache, load_model: Callable[[], Embeddings]):
+        """
+        Initialize the wrapper.
+
+        Args:
+            model_name: Embedding model name, part of every cache key
+            cache: Persistent embedding cache
+            load_model: Builds the underlying embeddings; called on the first cache miss
+        """
+        self.model_name = model_name
+        self.cache = cache
+        self._load_model = load_model
+        self._model: Optional[Embeddings] = None
+        self._model_lock = threading.Lock()
+        self.model_load_sec: Optional[float] = None
+
+    @property
+    def model(self) -> Embeddings:
+        """The underlying embeddings, loaded on first use"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    started = time.monotonic()
+                    self._model = self._load_model()
+                    self.model_load_sec = time.monotonic() - started
+                    logger.info(f"Loaded embedding model {self.model_name} in {self.model_load_sec:.2f}s")
+        return self._model
+
+    def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+        keys = [self.cache.make_key(self.model_name, text, kind) for text in texts]
+        vectors = self.cache.get_many(self.model_name, keys)
+
+        # Encode each distinct missing text once, in a single batch
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        if missing:
+            if kind == "query":
+                encoded = [self.model.embed_query(text) for text in missing.values()]
+            else:
+                encoded = self.model.embed_documents(list(missing.values()))
+            self.cache.put_many(self.model_name, list(missing), encoded)
+            fresh = dict(zip(missing, encoded))
+            vectors = [fresh[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+
+        return [np.asarray(vector, dtype=np.float32).tolist() for vector in vectors]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, running the model only on cache misses"""
+        return self._embed(list(texts), "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, running the model only on a cache miss"""
+        return self._embed([text], "query")[0]
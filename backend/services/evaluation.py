@@ -1,30 +1,16 @@
-import os
 import logging
 import re
 import json
 from typing import Dict, Any, Optional
-import yaml
 
 from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.pydantic_v1 import BaseModel, Field
+from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_mistralai import ChatMistralAI
 
-logger = logging.getLogger(__name__)
+from .llm_clients import llm_clients
+from .evaluation_cache import EvaluationCache
 
-# Load configuration
-try:
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.yaml")
-    if os.path.exists(config_path):
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
-    else:
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config.yaml")
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
-except Exception as e:
-    logger.error(f"Failed to load config: {e}")
-    config = {"mistral": {"api_key": "", "model": "mistral-large-latest"}}
+logger = logging.getLogger(__name__)
 
 # Define evaluation schema
 class AnswerEvaluationSchema(BaseModel):
@@ -36,6 +22,42 @@ class AnswerEvaluationSchema(BaseModel):
     overall_score: int = Field(description="Overall score from 0 to 100", ge=0, le=100)
     feedback: str = Field(description="Constructive feedback on the answer")
 
+# Prompt and parser are compiled once; only the question and answer vary per call
+ANSWER_EVALUATION_PROMPT_NAME = "answer_evaluation"
+ANSWER_EVALUATION_TEMPERATURE = 0.2
+# Bump whenever the prompt or schema changes so cached evaluations are not reused
+ANSWER_EVALUATION_PROMPT_VERSION = "1"
+
+answer_evaluation_parser = JsonOutputParser(pydantic_object=AnswerEvaluationSchema)
+
+answer_evaluation_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You are a helpful visa interview evaluator assistant."),
+    ("human", """
+    You are evaluating a response to a {visa_type} visa interview question.
+
+    Question: "{question}"
+    Answer: "{answer}"
+
+    Please evaluate this response on the following criteria on a scale of 1-100:
+
+    1. Fluency (How smoothly and naturally the response flows)
+    2. Confidence (How confident the applicant appears based on word choice)
+    3. Content Accuracy (How well the response addresses the question)
+    4. Clarity (How clear and understandable the response is)
+    5. Response Time (How quickly and effectively the candidate responded)
+
+    Also provide brief, constructive feedback on how the answer could be improved.
+
+    {format_instructions}
+    """)
+]).partial(format_instructions=answer_evaluation_parser.get_format_instructions())
+
+llm_clients.register_prompt(ANSWER_EVALUATION_PROMPT_NAME, answer_evaluation_prompt, answer_evaluation_parser)
+
+# Common answers recur across users, so identical evaluations are reused; memory
+# only until initialize_services applies the evaluation.cache configuration
+evaluation_cache = EvaluationCache({})
+
 async def evaluate_answer(question: str, answer: str, visa_type: str, response_time: Optional[float] = None) -> Dict[str, Any]:
     """
     Evaluate a user's answer to a visa interview question using LangChain.
@@ -64,59 +86,29 @@ async def evaluate_answer(question: str, answer: str, visa_type: str, response_t
             "feedback": "Your answer was too short. Try to provide more detailed responses to interview questions."
         }
 
-    # Initialize the LangChain model
-    api_key = os.environ.get("MISTRAL_API_KEY", config["mistral"].get("api_key", ""))
-    model_name = config["mistral"].get("model", "mistral-large-latest")
-    
-    if not api_key:
+    if not llm_clients.available:
         logger.warning("No Mistral API key, using fallback evaluation")
         return fallback_evaluation()
 
+    cache_key = evaluation_cache.make_key(
+        question, answer, visa_type,
+        f"{ANSWER_EVALUATION_PROMPT_VERSION}:{llm_clients.default_model}:{ANSWER_EVALUATION_TEMPERATURE}"
+    )
+    cached = await evaluation_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Evaluation cache hit: Overall score {cached['overall_score']}")
+        return cached
+
     try:
-        # Create the ChatMistralAI model
-        model = ChatMistralAI(
-            mistral_api_key=api_key,
-            model=model_name,
-            temperature=0.2
-        )
-        
-        # Create the parser
-        parser = JsonOutputParser(pydantic_object=AnswerEvaluationSchema)
-        
-        # Prepare prompt for LLM-based evaluation - Fixed the template issues
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are a helpful visa interview evaluator assistant."),
-            ("human", f"""
-            You are evaluating a response to a {visa_type} visa interview question.
-            
-            Question: "{question}"
-            Answer: "{answer}"
-            
-            Please evaluate this response on the following criteria on a scale of 1-100:
-            
-            1. Fluency (How smoothly and naturally the response flows)
-            2. Confidence (How confident the applicant appears based on word choice)
-            3. Content Accuracy (How well the response addresses the question)
-            4. Clarity (How clear and understandable the response is)
-            5. Response Time (How quickly and effectively the candidate responded)
-            
-            Also provide brief, constructive feedback on how the answer could be improved.
-            
-            {parser.get_format_instructions()}
-            """)
-        ])
-        
-        # Execute the chain
-        chain = prompt | model | parser
-        
-        # Execute the chain
-        evaluation = await chain.ainvoke({})
-        
+        chain = llm_clients.get_chain(ANSWER_EVALUATION_PROMPT_NAME, ANSWER_EVALUATION_TEMPERATURE)
+        evaluation = await chain.ainvoke({"visa_type": visa_type, "question": question, "answer": answer})
+
         # Convert to dictionary if needed
         if not isinstance(evaluation, dict):
             evaluation = evaluation.dict()
             
         logger.info(f"Evaluation successful: Overall score {evaluation['overall_score']}")
+        await evaluation_cache.set(cache_key, evaluation)
         return evaluation
 
     except Exception as e:
@@ -0,0 +1,184 @@
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationCache:
+    """LRU + TTL cache of answer evaluations with an optional SQLite tier"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the cache with configuration"""
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0,
+            "stores": 0, "evictions": 0, "expirations": 0,
+        }
+        self.configure(config)
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """
+        Apply the evaluation.cache configuration, dropping any cached entries.
+
+        Args:
+            config: Cache configuration
+        """
+        self.close()
+        self._entries.clear()
+        self.enabled = config.get("enabled", True)
+        self.max_entries = config.get("max_entries", 5000)
+        self.ttl_sec = config.get("ttl_sec", 7 * 24 * 3600)
+        self.sqlite_path = config.get("sqlite_path")
+
+        if self.enabled and self.sqlite_path:
+            self._open_db()
+
+    @staticmethod
+    def make_key(question: str, answer: str, visa_type: str, version: str) -> str:
+        """
+        Build the cache key for an evaluation.
+
+        Case, punctuation and whitespace are ignored so trivially different
+        transcripts of the same answer share an entry.
+
+        Args:
+            question: Interview question
+            answer: Transcribed answer
+            visa_type: Type of visa
+            version: Prompt and model version the evaluation was produced with
+
+        Returns:
+            Hex digest identifying the evaluation
+        """
+        def normalize(text: str) -> str:
+            return " ".join(re.sub(r"[^\w\s]", " ", (text or "").lower()).split())
+
+        payload = "\x00".join([version, visa_type.lower(), normalize(question), normalize(answer)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an evaluation.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            A copy of the cached evaluation, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return dict(value)
+            del self._entries[key]
+            self.stats["expirations"] += 1
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._db_get, key, now)
+            if row is not None:
+                expires_at, value = row
+                self._remember(key, expires_at, value)
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                return dict(value)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store an evaluation.
+
+        Args:
+            key: Key from make_key
+            value: Evaluation produced by the LLM
+        """
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_sec
+        self._remember(key, expires_at, dict(value))
+        self.stats["stores"] += 1
+        if self._db is not None:
+            try:
+                await asyncio.to_thread(self._db_set, key, expires_at, value)
+            except Exception as e:
+                logger.warning(f"Failed to persist evaluation cache entry: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "persistent": self._db is not None,
+        }
+
+    def close(self) -> None:
+        """Close the SQLite tier"""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, expires_at: float, value: Dict[str, Any]) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _open_db(self) -> None:
+        """Open the SQLite tier and drop expired rows"""
+        try:
+            directory = os.path.dirname(self.sqlite_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations "
+                "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            removed = self._db.execute("DELETE FROM evaluations WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._db.commit()
+            logger.info(f"Opened evaluation cache at {self.sqlite_path} ({removed} expired entries removed)")
+        except Exception as e:
+            logger.warning(f"Evaluation cache persistence disabled: {str(e)}")
+            self._db = None
+
+    def _db_get(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT expires_at, value FROM evaluations WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _db_set(self, key: str, expires_at: float, value: Dict[str, Any]) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO evaluations (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, expires_at, json.dumps(value))
+            )
+            self._db.commit()
@@ -1,7 +1,7 @@
 import logging
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from models import AnswerEvaluation, EvaluationResult
 from services.llm import LLMService
@@ -192,6 +192,60 @@ class EvaluatorService:
                 areas_to_improve=["Continue practicing"]
             )
 
+    def quick_evaluate(self, answer: str, response_time_sec: Optional[float] = None) -> AnswerEvaluation:
+        """
+        Score an answer locally, without the LLM.
+
+        The scores are provisional and are replaced once the LLM evaluation
+        of the same answer is available.
+
+        Args:
+            answer: The answer text
+            response_time_sec: Seconds between the question and the start of the answer
+
+        Returns:
+            Provisional answer evaluation
+        """
+        word_count = len(answer.split()) if answer else 0
+        if response_time_sec is None:
+            response_time_score = 60.0
+        else:
+            response_time_score = self.calculate_response_time_score(response_time_sec)
+
+        return AnswerEvaluation(
+            fluency_score=round(self.evaluate_fluency(answer)),
+            confidence_score=round(self.evaluate_confidence(answer)),
+            # Without the LLM, level of detail is the best available proxy for content
+            content_accuracy_score=round(min(80, 30 + word_count * 2)),
+            clarity_score=round(self.evaluate_clarity(answer)),
+            response_time_score=round(response_time_score),
+            feedback="Provisional scores. Detailed feedback will follow shortly.",
+            provisional=True
+        )
+
+    def evaluate_clarity(self, text: str) -> float:
+        """
+        Evaluate clarity based on sentence length.
+
+        Args:
+            text: The answer text
+
+        Returns:
+            Clarity score (0-100)
+        """
+        if not text or len(text) < 10:
+            return 25.0
+
+        sentences = [s for s in re.split(r'[.!?]+', text) if s.strip()]
+        avg_length = len(text.split()) / max(1, len(sentences))
+
+        # Sentences of 8-20 words are easiest to follow
+        if avg_length < 8:
+            return max(40, 75 - (8 - avg_length) * 5)
+        if avg_length <= 20:
+            return 80
+        return max(40, 80 - (avg_length - 20) * 2)
+
     def evaluate_fluency(self, text: str) -> float:
         """
         Evaluate fluency based on text characteristics.
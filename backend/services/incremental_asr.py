@@ -0,0 +1,254 @@
+import re
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+
+from .audio_utils import pcm_to_wav
+from .audio_buffer import AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+# Matroska/WebM Cluster element ID; everything before the first one is the
+# container header that every segment needs in order to be decodable
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+
+# A Cluster opens with its Timestamp element, or with a CRC-32 guarding it
+WEBM_CLUSTER_FIRST_CHILD_IDS = (0xE7, 0xBF)
+
+# Cluster ID, the longest EBML size and the first child ID needed to verify a match
+WEBM_CLUSTER_PROBE_BYTES = 4 + 8 + 1
+
+# Segments below this size are rejected by the transcription API
+MIN_SEGMENT_BYTES = 1000
+
+# How far back the stitcher looks for words repeated by an overlapping segment
+STITCH_MAX_WORDS = 12
+STITCH_MAX_SKIP = 2
+
+
+def find_webm_clusters(data: bytes) -> Tuple[List[int], int]:
+    """
+    Find the Cluster elements in a piece of a WebM stream.
+
+    The Cluster ID can also occur inside Opus payloads, so a match only counts
+    when it is followed by a valid EBML size and a Cluster's first child.
+
+    Args:
+        data: Bytes of the stream
+
+    Returns:
+        Tuple of (offsets of the Clusters, offset from which the next scan must
+        resume because matches beyond it could not be verified yet)
+    """
+    offsets = []
+    limit = len(data) - WEBM_CLUSTER_PROBE_BYTES
+    i = data.find(WEBM_CLUSTER_ID)
+    while 0 <= i <= limit:
+        size_byte = data[i + 4]
+        if size_byte:
+            size_length = 9 - size_byte.bit_length()
+            if data[i + 4 + size_length] in WEBM_CLUSTER_FIRST_CHILD_IDS:
+                offsets.append(i)
+        i = data.find(WEBM_CLUSTER_ID, i + 1)
+    return offsets, max(0, limit + 1)
+
+
+class IncrementalTranscriber:
+    """Transcribes stable segments of an answer while it is still being recorded"""
+
+    def __init__(
+        self,
+        transcribe: Callable[[bytes], Awaitable[str]],
+        config: Dict[str, Any],
+        buffer: AudioBuffer,
+        on_partial: Optional[Callable[[str], Awaitable[None]]] = None,
+        pcm_sample_rate: Optional[int] = None,
+        compactor=None
+    ):
+        """
+        Initialize the transcriber.
+
+        Args:
+            transcribe: Coroutine transcribing one segment, raising on failure
+            config: Incremental ASR configuration
+            buffer: Session audio buffer the recorded chunks are appended to
+            on_partial: Coroutine called with the stitched transcript so far
+            pcm_sample_rate: Sample rate when chunks are raw 16-bit PCM instead of WebM
+            compactor: Optional SilenceCompactor applied to PCM segments before upload
+        """
+        self.transcribe = transcribe
+        self.buffer = buffer
+        self.on_partial = on_partial
+        self.pcm_sample_rate = pcm_sample_rate
+        self.compactor = compactor
+        self.bytes_saved = 0
+        self.min_segment_bytes = config.get("min_segment_bytes", 40000)
+        self.max_segment_bytes = config.get("max_segment_bytes", 160000)
+        # Audio repeated at the start of a segment that was not cut in a pause,
+        # so a word split by the cut is heard whole by one of the two segments
+        overlap_ms = config.get("overlap_ms", 500)
+        self.overlap_bytes = int(pcm_sample_rate * overlap_ms / 1000) * 2 if pcm_sample_rate else 0
+
+        # Offsets of the WebM Clusters seen so far; segments only start at these
+        self._clusters: List[int] = []
+        self._scanned = 0
+        self._segment_start = 0
+        self._read_start = 0
+        self._segment_end = 0
+        self._segments: List[asyncio.Task] = []
+        self._overlapped: List[bool] = []
+        self._published = 0
+        self._finished = False
+        self._publishers = set()
+
+    def add_chunk(self, chunk: bytes, boundary: bool = False) -> None:
+        """
+        Note a chunk appended to the buffer and cut a segment when one is ready.
+
+        Args:
+            chunk: Encoded audio chunk as received from the client
+            boundary: Whether the chunk ends at a silence boundary
+        """
+        self._segment_end = len(self.buffer)
+        if self.pcm_sample_rate:
+            cut = self._segment_end
+        else:
+            # Compressed audio can only be split where a Cluster starts
+            self._scan_clusters()
+            cut = self._clusters[-1] if self._clusters else 0
+
+        pending = cut - self._segment_start
+        if boundary and pending >= self.min_segment_bytes and self.pcm_sample_rate:
+            self._cut(cut, overlap=False)
+        elif pending >= self.max_segment_bytes or (boundary and pending >= self.min_segment_bytes):
+            self._cut(cut, overlap=True)
+
+    async def finish(self) -> str:
+        """
+        Transcribe the remaining audio and stitch all segment transcripts.
+
+        Returns:
+            Full transcript of the answer
+
+        Raises:
+            Exception: If any segment failed to transcribe
+        """
+        if self._segment_end > self._segment_start:
+            self._cut(self._segment_end, overlap=False)
+        self._finished = True
+        transcripts = await asyncio.gather(*self._segments)
+        return self._stitch(transcripts)
+
+    def cancel(self) -> None:
+        """Cancel outstanding segment transcriptions"""
+        for task in self._segments:
+            if not task.done():
+                task.cancel()
+
+    def _scan_clusters(self) -> None:
+        """Record the Clusters in the bytes received since the previous scan"""
+        with self.buffer.view() as view:
+            data = bytes(view[self._scanned:self._segment_end])
+        offsets, resume = find_webm_clusters(data)
+        self._clusters.extend(self._scanned + offset for offset in offsets)
+        self._scanned += resume
+
+    def _header(self, view: memoryview) -> bytes:
+        """Container header every WebM segment after the first needs to be decodable"""
+        return bytes(view[:self._clusters[0]]) if self._clusters else b""
+
+    def _cut(self, end: int, overlap: bool) -> None:
+        """
+        Start transcribing the audio received since the previous cut.
+
+        Args:
+            end: Buffer offset to cut at; a Cluster start for WebM
+            overlap: Whether the next segment repeats the tail of this one
+        """
+        read_start, start = self._read_start, self._segment_start
+        self._segment_start = self._read_start = end
+        if overlap:
+            if self.pcm_sample_rate:
+                self._read_start = max(start, end - self.overlap_bytes)
+            else:
+                # Repeat the last Cluster before the cut, unless it is the whole segment
+                previous = [offset for offset in self._clusters if start < offset < end]
+                if previous:
+                    self._read_start = previous[-1]
+        self._overlapped.append(read_start < start)
+
+        with self.buffer.view() as view:
+            # Later WebM segments start mid-stream and need the container header
+            prefix = self._header(view) if not self.pcm_sample_rate and read_start > 0 else b""
+            segment = prefix + view[read_start:end]
+        if end - start < MIN_SEGMENT_BYTES:
+            self._segments.append(asyncio.create_task(self._empty()))
+            return
+        if self.pcm_sample_rate:
+            if self.compactor:
+                segment, report = self.compactor.compact(segment, self.pcm_sample_rate)
+                self.bytes_saved += report["bytes_saved"]
+            segment = pcm_to_wav(segment, self.pcm_sample_rate)
+
+        task = asyncio.create_task(self.transcribe(segment))
+        task.add_done_callback(self._schedule_publish)
+        self._segments.append(task)
+        logger.info(f"Transcribing answer segment {len(self._segments)} ({len(segment)} bytes)")
+
+    def _schedule_publish(self, _task: asyncio.Task) -> None:
+        """Publish progress once a segment transcription finishes"""
+        if self.on_partial is None or self._finished:
+            return
+        publisher = asyncio.create_task(self._publish())
+        self._publishers.add(publisher)
+        publisher.add_done_callback(self._publishers.discard)
+
+    async def _publish(self) -> None:
+        """Push the transcript of all contiguous completed segments"""
+        done = 0
+        for task in self._segments:
+            if not task.done() or task.cancelled() or task.exception() is not None:
+                break
+            done += 1
+        if done <= self._published:
+            return
+        self._published = done
+        try:
+            await self.on_partial(self._stitch([task.result() for task in self._segments[:done]]))
+        except Exception as e:
+            logger.warning(f"Failed to publish partial transcript: {str(e)}")
+
+    @staticmethod
+    async def _empty() -> str:
+        return ""
+
+    def _stitch(self, transcripts: List[str]) -> str:
+        """Join segment transcripts, dropping words repeated by overlapping segments"""
+        words: List[str] = []
+        for transcript, overlapped in zip(transcripts, self._overlapped):
+            new_words = (transcript or "").split()
+            if overlapped and words:
+                new_words = new_words[self._repeated_prefix(words, new_words):]
+            words.extend(new_words)
+        return " ".join(words)
+
+    @staticmethod
+    def _repeated_prefix(previous: List[str], new: List[str]) -> int:
+        """
+        Count the leading words of a segment that repeat the end of the previous one.
+
+        A word cut in half at the start of the overlap may come out garbled, so
+        up to STITCH_MAX_SKIP words before the repeated run are dropped with it.
+        """
+        def normalize(word: str) -> str:
+            return re.sub(r"[^\w']", "", word.lower())
+
+        tail = [normalize(word) for word in previous[-STITCH_MAX_WORDS:]]
+        head = [normalize(word) for word in new[:STITCH_MAX_WORDS + STITCH_MAX_SKIP]]
+        for length in range(min(len(tail), len(head)), 0, -1):
+            # A single repeated word is only trusted right at the start
+            max_skip = STITCH_MAX_SKIP if length > 1 else 0
+            for skip in range(min(max_skip, len(head) - length) + 1):
+                if head[skip:skip + length] == tail[-length:]:
+                    return skip + length
+        return 0
@@ -1,13 +1,13 @@
 import logging
 import os
-from typing import List, Dict, Any, Optional
-import yaml
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 import json
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_mistralai import ChatMistralAI
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
 from pydantic import BaseModel, Field  # Changed from langchain_core.pydantic_v1
 
+from .llm_clients import llm_clients
+
 logger = logging.getLogger(__name__)
 
 class EvaluationSchema(BaseModel):
@@ -17,6 +17,101 @@ class EvaluationSchema(BaseModel):
     strengths: List[str] = Field(description="2-3 specific strengths")
     areas_to_improve: List[str] = Field(description="2-3 specific improvement areas")
 
+FINAL_EVALUATION_PROMPT_NAME = "final_evaluation"
+FINAL_EVALUATION_TEMPERATURE = 0.4
+
+final_evaluation_parser = JsonOutputParser(pydantic_object=EvaluationSchema)
+
+final_evaluation_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert visa interview evaluator providing detailed, constructive feedback."),
+    ("human", """
+        You are an expert visa interview evaluator. Please provide a comprehensive evaluation
+        of this {visa_type} visa interview:
+
+        {qa_pairs}
+
+        Evaluate the interview on the following aspects:
+        1. Overall performance
+        2. Communication skills (fluency, clarity)
+        3. Content accuracy and relevance
+        4. Confidence and presentation
+        5. Areas of strength
+        6. Areas needing improvement
+
+        {format_instructions}
+        """)
+]).partial(format_instructions=final_evaluation_parser.get_format_instructions())
+
+llm_clients.register_prompt(FINAL_EVALUATION_PROMPT_NAME, final_evaluation_prompt, final_evaluation_parser)
+
+# Incremental mode: the summary is folded forward after every answer, so the
+# final call only synthesizes from a fixed-size input
+SUMMARY_UPDATE_PROMPT_NAME = "summary_update"
+SUMMARY_UPDATE_TEMPERATURE = 0.2
+SUMMARY_FINAL_EVALUATION_PROMPT_NAME = "summary_final_evaluation"
+
+summary_update_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You maintain a concise running summary of a visa interview for the final evaluator."),
+    ("human", """
+        Summary of the {visa_type} visa interview so far:
+        {summary}
+
+        New exchange (question {number}):
+        Question: "{question}"
+        Answer: "{answer}"
+        Evaluator feedback: "{feedback}"
+
+        Rewrite the summary so it also covers the new exchange. Keep the applicant's key facts,
+        notable strengths and weaknesses, and any inconsistencies between answers.
+        Use at most {max_words} words and return only the summary text.
+        """)
+])
+
+summary_final_evaluation_prompt = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert visa interview evaluator providing detailed, constructive feedback."),
+    ("human", """
+        You are an expert visa interview evaluator. Please provide a comprehensive evaluation
+        of this {visa_type} visa interview of {answer_count} answers, based on the running
+        summary and the average per-answer scores below.
+
+        Summary:
+        {summary}
+
+        Average scores (0-100):
+        {scores}
+
+        Evaluate the interview on the following aspects:
+        1. Overall performance
+        2. Communication skills (fluency, clarity)
+        3. Content accuracy and relevance
+        4. Confidence and presentation
+        5. Areas of strength
+        6. Areas needing improvement
+
+        {format_instructions}
+        """)
+]).partial(format_instructions=final_evaluation_parser.get_format_instructions())
+
+llm_clients.register_prompt(SUMMARY_UPDATE_PROMPT_NAME, summary_update_prompt, StrOutputParser())
+llm_clients.register_prompt(SUMMARY_FINAL_EVALUATION_PROMPT_NAME, summary_final_evaluation_prompt, final_evaluation_parser)
+
+
+def error_final_evaluation() -> Dict[str, Any]:
+    """Default final evaluation used when the LLM call fails"""
+    return {
+        "overall_score": 65,
+        "feedback_summary": "An error occurred during evaluation. Thank you for your participation.",
+        "detailed_scores": {
+            "fluency": 65,
+            "confidence": 65,
+            "content_accuracy": 65,
+            "clarity": 65,
+            "response_time": 65
+        },
+        "strengths": ["Completed the interview session"],
+        "areas_to_improve": ["Technical issues prevented detailed feedback"]
+    }
+
 class LLMService:
     """Service for interacting with LLM APIs (Mistral) using LangChain"""
 
@@ -27,16 +122,10 @@ class LLMService:
         self.model = config.get("model", "mistral-large-latest")
         self.max_tokens = config.get("max_tokens", 1024)
 
-        # Initialize LangChain chat model
-        if self.api_key:
-            self.chat_model = ChatMistralAI(
-                model=self.model,
-                mistral_api_key=self.api_key,
-                max_tokens=self.max_tokens
-            )
-        else:
+        # Chat models are shared with the per-answer evaluation
+        self.clients = llm_clients
+        if not self.clients.available:
             logger.warning("No Mistral API key provided. LLM functionality will be limited.")
-            self.chat_model = None
 
     async def generate_completion(
         self,
@@ -55,7 +144,7 @@ class LLMService:
         Returns:
             Generated text response
         """
-        if not self.chat_model:
+        if not self.clients.available:
             logger.error("Cannot generate completion: No API key provided")
             return "API key not configured. Please check configuration."
 
@@ -67,7 +156,7 @@ class LLMService:
             ])
 
             # Create chain
-            chain = chat_template | self.chat_model
+            chain = chat_template | self.clients.get_model(temperature, self.model)
 
             # Invoke the chain
             response = await chain.ainvoke({})
@@ -97,7 +186,7 @@ class LLMService:
         Returns:
             Generated text response
         """
-        if not self.chat_model:
+        if not self.clients.available:
             logger.error("Cannot generate response: No API key provided")
             return "API key not configured. Please check configuration."
 
@@ -120,7 +209,7 @@ class LLMService:
             chat_template = ChatPromptTemplate.from_messages(formatted_messages)
 
             # Create and invoke chain
-            chain = chat_template | self.chat_model.with_temperature(temperature)
+            chain = chat_template | self.clients.get_model(temperature, self.model)
             response = await chain.ainvoke({})
 
             return response.content
@@ -129,11 +218,30 @@ class LLMService:
             logger.error(f"LLM response error: {str(e)}")
             return f"Error generating response: {str(e)}"
 
+    async def _run_evaluation_chain(
+        self,
+        chain,
+        inputs: Dict[str, Any],
+        on_partial: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ):
+        """Invoke a JSON chain, streaming partially parsed results to on_partial if given"""
+        if on_partial is None:
+            return await chain.ainvoke(inputs)
+
+        result = None
+        async for partial in chain.astream(inputs):
+            result = partial
+            await on_partial(partial)
+        if result is None:
+            raise ValueError("LLM returned an empty final evaluation")
+        return result
+
     async def generate_final_evaluation(
         self,
         questions: List[str],
         answers: List[str],
-        visa_type: str
+        visa_type: str,
+        on_partial: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         Generate a comprehensive final evaluation of the interview using LangChain.
@@ -142,6 +250,7 @@ class LLMService:
             questions: List of all questions asked
             answers: List of all transcribed answers
             visa_type: Type of visa (tourist or student)
+            on_partial: Coroutine called with the partially parsed result while streaming
 
         Returns:
             Dictionary containing evaluation metrics and feedback
@@ -152,39 +261,11 @@ class LLMService:
             qa_pairs += f"Question {i+1}: {q}\n"
             qa_pairs += f"Answer {i+1}: {a}\n\n"
 
-        prompt = f"""
-        You are an expert visa interview evaluator. Please provide a comprehensive evaluation
-        of this {visa_type} visa interview:
-
-        {qa_pairs}
-
-        Evaluate the interview on the following aspects:
-        1. Overall performance
-        2. Communication skills (fluency, clarity)
-        3. Content accuracy and relevance
-        4. Confidence and presentation
-        5. Areas of strength
-        6. Areas needing improvement
-        """
-
-        system_message = "You are an expert visa interview evaluator providing detailed, constructive feedback."
-
         try:
-            # Setup the parser
-            parser = JsonOutputParser(pydantic_object=EvaluationSchema)
-
-            # Build the chain
-            chain = (
-                ChatPromptTemplate.from_messages([
-                    ("system", system_message),
-                    ("human", prompt + "\n\n" + parser.get_format_instructions())
-                ])
-                | self.chat_model.with_temperature(0.4)
-                | parser
-            )
+            chain = self.clients.get_chain(FINAL_EVALUATION_PROMPT_NAME, FINAL_EVALUATION_TEMPERATURE, self.model)
 
             # Execute the chain
-            result = await chain.ainvoke({})
+            result = await self._run_evaluation_chain(chain, {"visa_type": visa_type, "qa_pairs": qa_pairs}, on_partial)
 
             # Ensure all required fields are present and properly formatted
             if not isinstance(result, dict):
@@ -212,16 +293,84 @@ class LLMService:
         except Exception as e:
             logger.error(f"Error generating final evaluation: {str(e)}")
             # Return default evaluation
-            return {
-                "overall_score": 65,
-                "feedback_summary": "An error occurred during evaluation. Thank you for your participation.",
-                "detailed_scores": {
-                    "fluency": 65,
-                    "confidence": 65,
-                    "content_accuracy": 65,
-                    "clarity": 65,
-                    "response_time": 65
-                },
-                "strengths": ["Completed the interview session"],
-                "areas_to_improve": ["Technical issues prevented detailed feedback"]
-            }
+            return error_final_evaluation()
+
+    async def update_summary(
+        self,
+        summary: str,
+        number: int,
+        question: str,
+        answer: str,
+        feedback: str,
+        visa_type: str,
+        max_words: int = 150
+    ) -> str:
+        """
+        Fold one evaluated answer into the running interview summary.
+
+        Args:
+            summary: Summary of the previous answers
+            number: 1-based question number
+            question: The question asked
+            answer: The transcribed answer
+            feedback: Feedback from the answer's evaluation
+            visa_type: Type of visa (tourist or student)
+            max_words: Upper bound on the summary length
+
+        Returns:
+            Updated summary
+
+        Raises:
+            Exception: If the LLM call fails
+        """
+        if not self.clients.available:
+            raise RuntimeError("No API key provided")
+        chain = self.clients.get_chain(SUMMARY_UPDATE_PROMPT_NAME, SUMMARY_UPDATE_TEMPERATURE, self.model)
+        result = await chain.ainvoke({
+            "visa_type": visa_type,
+            "summary": summary or "(no answers yet)",
+            "number": number,
+            "question": question,
+            "answer": answer,
+            "feedback": feedback,
+            "max_words": max_words
+        })
+        return result.strip()
+
+    async def generate_final_evaluation_from_summary(
+        self,
+        summary: str,
+        average_scores: Dict[str, float],
+        answer_count: int,
+        visa_type: str,
+        on_partial: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate the final evaluation from the rolling summary instead of the full transcript.
+
+        Args:
+            summary: Rolling summary of the interview
+            average_scores: Average per-answer scores by criterion
+            answer_count: Number of answers given
+            visa_type: Type of visa (tourist or student)
+            on_partial: Coroutine called with the partially parsed result while streaming
+
+        Returns:
+            Dictionary containing evaluation metrics and feedback
+        """
+        scores = "\n".join(f"- {name}: {score:.1f}" for name, score in average_scores.items())
+        try:
+            chain = self.clients.get_chain(SUMMARY_FINAL_EVALUATION_PROMPT_NAME, FINAL_EVALUATION_TEMPERATURE, self.model)
+            result = await self._run_evaluation_chain(chain, {
+                "visa_type": visa_type,
+                "answer_count": answer_count,
+                "summary": summary,
+                "scores": scores or "- not available"
+            }, on_partial)
+            if not isinstance(result, dict):
+                result = result.dict()
+            return result
+
+        except Exception as e:
+            logger.error(f"Error generating final evaluation from summary: {str(e)}")
+            return error_final_evaluation()
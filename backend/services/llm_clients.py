@@ -0,0 +1,129 @@
+import os
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_mistralai import ChatMistralAI
+
+logger = logging.getLogger(__name__)
+
+class LLMClientRegistry:
+    """Owns long-lived chat model clients and precompiled prompt chains"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize the registry with the Mistral configuration"""
+        # Each client keeps its own pooled HTTP connections, so they are built once
+        self._models: Dict[Tuple[str, float], ChatMistralAI] = {}
+        self._prompts: Dict[str, Tuple[ChatPromptTemplate, Any]] = {}
+        self._chains: Dict[Tuple[str, str, float], Any] = {}
+        self.configure(config or {})
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """
+        Apply the Mistral configuration. Registered prompts are kept; clients
+        and chains are rebuilt with the new settings on next use.
+
+        Args:
+            config: Mistral configuration
+        """
+        self.api_key = os.environ.get("MISTRAL_API_KEY", config.get("api_key", ""))
+        self.default_model = config.get("model", "mistral-large-latest")
+        self.max_tokens = config.get("max_tokens", 1024)
+        self.timeout = config.get("timeout_sec", 120)
+        self.max_retries = config.get("max_retries", 5)
+        self.max_concurrent_requests = config.get("max_concurrent_requests", 64)
+        self._models.clear()
+        self._chains.clear()
+
+    @property
+    def available(self) -> bool:
+        """Whether an API key is configured"""
+        return bool(self.api_key)
+
+    def get_model(self, temperature: float, model: Optional[str] = None) -> ChatMistralAI:
+        """
+        Return the shared client for a model and temperature, creating it on first use.
+
+        Args:
+            temperature: Sampling temperature
+            model: Model name, or the configured default
+
+        Returns:
+            Chat model client
+        """
+        key = (model or self.default_model, float(temperature))
+        client = self._models.get(key)
+        if client is None:
+            client = ChatMistralAI(
+                mistral_api_key=self.api_key,
+                model=key[0],
+                temperature=key[1],
+                max_tokens=self.max_tokens,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                max_concurrent_requests=self.max_concurrent_requests
+            )
+            self._models[key] = client
+            logger.info(f"Created LLM client for {key[0]} at temperature {key[1]}")
+        return client
+
+    def register_prompt(self, name: str, prompt: ChatPromptTemplate, parser=None) -> None:
+        """
+        Register a precompiled prompt and its output parser under a name.
+
+        Args:
+            name: Prompt name used to look up its chain
+            prompt: Prompt template with format instructions already applied
+            parser: Optional output parser appended to the chain
+        """
+        self._prompts[name] = (prompt, parser)
+        for key in [k for k in self._chains if k[0] == name]:
+            del self._chains[key]
+
+    def get_chain(self, name: str, temperature: float, model: Optional[str] = None):
+        """
+        Return the prompt | model | parser chain for a registered prompt.
+
+        Args:
+            name: Registered prompt name
+            temperature: Sampling temperature
+            model: Model name, or the configured default
+
+        Returns:
+            Runnable chain
+        """
+        key = (name, model or self.default_model, float(temperature))
+        chain = self._chains.get(key)
+        if chain is None:
+            prompt, parser = self._prompts[name]
+            chain = prompt | self.get_model(temperature, model)
+            if parser is not None:
+                chain = chain | parser
+            self._chains[key] = chain
+        return chain
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the number of live clients and chains"""
+        return {
+            "available": self.available,
+            "clients": [f"{model}@{temperature}" for model, temperature in self._models],
+            "prompts": list(self._prompts),
+            "chains": len(self._chains),
+        }
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections of every client"""
+        for client in self._models.values():
+            async_client = getattr(client, "async_client", None)
+            if async_client is not None:
+                try:
+                    await async_client.aclose()
+                except Exception as e:
+                    logger.warning(f"Failed to close LLM client: {str(e)}")
+        self._models.clear()
+        self._chains.clear()
+
+
+# Shared registry for the whole process; prompts register at import time and
+# initialize_services applies the Mistral configuration
+llm_clients = LLMClientRegistry()
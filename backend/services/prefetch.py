@@ -0,0 +1,99 @@
+import time
+import asyncio
+import logging
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionPrefetcher:
+    """Synthesizes a session's upcoming questions in the background"""
+
+    def __init__(self, tts_service, config: Dict[str, Any]):
+        """Initialize the prefetcher with the TTS service and configuration"""
+        self.tts_service = tts_service
+        self.concurrency = max(1, config.get("prefetch_concurrency", 3))
+        # Unclaimed prefetches of a session are forgotten this long after the
+        # last one finished, so abandoned sessions stop protecting their files
+        self.ttl_sec = config.get("prefetch_ttl_sec", 1800)
+
+        # session_id -> question index -> synthesis task
+        self._tasks: Dict[str, Dict[int, asyncio.Task]] = {}
+        # session_id -> when its most recent prefetch finished
+        self._finished_at: Dict[str, float] = {}
+
+    def schedule(self, session_id: str, questions: List[str], voice_id: str, start_index: int = 1) -> None:
+        """
+        Start background synthesis for questions[start_index:].
+
+        Args:
+            session_id: Session the questions belong to
+            questions: Full question list of the session
+            voice_id: Voice to synthesize with
+            start_index: First question index to prefetch
+        """
+        self._expire()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        session_tasks = self._tasks.setdefault(session_id, {})
+
+        async def synthesize(question: str) -> str:
+            async with semaphore:
+                return await self.tts_service.synthesize(question, voice_id)
+
+        for index in range(start_index, len(questions)):
+            if index not in session_tasks:
+                task = session_tasks[index] = asyncio.create_task(synthesize(questions[index]))
+                task.add_done_callback(lambda _: self._finished_at.__setitem__(session_id, time.monotonic()))
+
+        logger.info(f"Prefetching {len(questions) - start_index} questions for session {session_id}")
+
+    async def get_audio_url(self, session_id: str, index: int, question: str, voice_id: str) -> str:
+        """
+        Return the audio URL for a question, awaiting its prefetch if scheduled.
+
+        Args:
+            session_id: Session the question belongs to
+            index: Question index within the session
+            question: Question text, used if no prefetch is available
+            voice_id: Voice to synthesize with
+
+        Returns:
+            URL path to the audio file
+        """
+        task = self._tasks.get(session_id, {}).pop(index, None)
+        if task is not None:
+            try:
+                return await task
+            except Exception as e:
+                logger.warning(f"Prefetch failed for session {session_id} question {index}: {str(e)}")
+
+        return await self.tts_service.synthesize(question, voice_id)
+
+    def ready_audio_urls(self) -> List[str]:
+        """Return URLs of prefetched audio that has not been handed out yet"""
+        self._expire()
+        return [
+            task.result()
+            for session_tasks in self._tasks.values()
+            for task in session_tasks.values()
+            if task.done() and not task.cancelled() and task.exception() is None
+        ]
+
+    def cancel(self, session_id: str) -> None:
+        """Cancel any outstanding prefetches for a session"""
+        self._finished_at.pop(session_id, None)
+        for task in self._tasks.pop(session_id, {}).values():
+            if not task.done():
+                task.cancel()
+
+    def _expire(self) -> None:
+        """Forget sessions whose prefetches all finished more than ttl_sec ago"""
+        now = time.monotonic()
+        for session_id, session_tasks in list(self._tasks.items()):
+            if not all(task.done() for task in session_tasks.values()):
+                continue
+            finished_at = self._finished_at.get(session_id)
+            if session_tasks and (finished_at is None or now - finished_at < self.ttl_sec):
+                continue
+            del self._tasks[session_id]
+            self._finished_at.pop(session_id, None)
@@ -0,0 +1,166 @@
+import logging
+import threading
+from typing import Dict, Any, List, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so dot products are cosine similarities"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class Ranking(NamedTuple):
+    """Consistent view of a QuestionBank at one point in time"""
+    size: int
+    matrix: np.ndarray
+    relevance: np.ndarray
+    order: np.ndarray
+
+
+class QuestionBank:
+    """Contiguous embedding matrix and relevance ranking of one visa type's questions"""
+
+    def __init__(self, query: np.ndarray):
+        """
+        Initialize an empty bank.
+
+        Args:
+            query: Embedding of the query questions are ranked against
+        """
+        self.query = _normalize(np.asarray(query, dtype=np.float32))
+        self.texts: List[str] = []
+        self._seen = set()
+        self._matrix = np.empty((0, self.query.shape[0]), dtype=np.float32)
+        # Replaced as a whole, so a reader on another thread never sees a half-applied add
+        self.ranking = Ranking(0, self._matrix, np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64))
+
+    @property
+    def size(self) -> int:
+        """Number of questions in the bank"""
+        return self.ranking.size
+
+    def add(self, texts: List[str], embeddings) -> int:
+        """
+        Append questions, skipping ones already in the bank.
+
+        Only one thread may add at a time; rows and texts are written past the
+        published size before the new ranking is published.
+
+        Args:
+            texts: Question texts
+            embeddings: Matching embeddings
+
+        Returns:
+            Number of questions added
+        """
+        keep = []
+        for i, text in enumerate(texts):
+            if text not in self._seen:
+                self._seen.add(text)
+                keep.append(i)
+        if not keep:
+            return 0
+
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32)[keep])
+        size = self.size
+        end = size + len(keep)
+        if end > self._matrix.shape[0]:
+            # Grow geometrically so repeated additions stay amortized O(1) per row
+            grown = np.empty((max(end, 2 * self._matrix.shape[0], 64), self._matrix.shape[1]), dtype=np.float32)
+            grown[:size] = self._matrix[:size]
+            self._matrix = grown
+        self._matrix[size:end] = vectors
+        self.texts.extend(texts[i] for i in keep)
+
+        relevance = np.concatenate([self.ranking.relevance, vectors @ self.query])
+        order = np.argsort(-relevance, kind="stable")
+        self.ranking = Ranking(end, self._matrix[:end], relevance, order)
+        return len(keep)
+
+
+class QuestionSelector:
+    """Picks varied but relevant question sets with maximal marginal relevance"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the selector with configuration"""
+        self.config = config
+        self.strategy = config.get("strategy", "mmr")
+        self.diversity = config.get("diversity", 0.3)
+        self.candidate_pool = config.get("candidate_pool", 64)
+        self.temperature = config.get("temperature", 0.05)
+        self._banks: Dict[str, QuestionBank] = {}
+        # Additions run on worker threads; select reads the published rankings without it
+        self._add_lock = threading.Lock()
+
+    def add(self, visa_type: str, texts: List[str], embeddings, query: np.ndarray) -> int:
+        """
+        Add questions to the bank of a visa type.
+
+        Args:
+            visa_type: Visa type the questions belong to
+            texts: Question texts
+            embeddings: Matching embeddings
+            query: Embedding of the ranking query, used when the bank is created
+
+        Returns:
+            Number of questions added
+        """
+        with self._add_lock:
+            bank = self._banks.get(visa_type)
+            if bank is None:
+                bank = QuestionBank(query)
+                added = bank.add(texts, embeddings)
+                self._banks[visa_type] = bank
+                return added
+            return bank.add(texts, embeddings)
+
+    def select(self, visa_type: str, k: int, seed: Optional[int] = None) -> List[str]:
+        """
+        Select up to k questions for an interview.
+
+        Args:
+            visa_type: Visa type to select from
+            k: Number of questions
+            seed: Seed for the per-request randomness; equal seeds give equal sets
+
+        Returns:
+            Selected questions, most relevant first
+        """
+        bank = self._banks.get(visa_type)
+        if bank is None:
+            return []
+        ranking = bank.ranking
+        if ranking.size == 0:
+            return []
+        k = min(k, ranking.size)
+        if self.strategy != "mmr":
+            return [bank.texts[i] for i in ranking.order[:k]]
+
+        # MMR only needs the most relevant slice of the precomputed ranking
+        pool = ranking.order[:min(ranking.size, max(self.candidate_pool, 4 * k))]
+        vectors = ranking.matrix[pool]
+        relevance = ranking.relevance[pool]
+        if self.temperature > 0:
+            rng = np.random.default_rng(seed)
+            relevance = relevance + rng.gumbel(scale=self.temperature, size=len(pool)).astype(np.float32)
+
+        similarity = vectors @ vectors.T
+        redundancy = np.zeros(len(pool), dtype=np.float32)
+        chosen = np.zeros(len(pool), dtype=bool)
+        selected: List[int] = []
+        for _ in range(k):
+            scores = (1 - self.diversity) * relevance - self.diversity * redundancy
+            scores[chosen] = -np.inf
+            best = int(np.argmax(scores))
+            selected.append(best)
+            chosen[best] = True
+            np.maximum(redundancy, similarity[best], out=redundancy)
+        return [bank.texts[pool[i]] for i in selected]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the number of questions per visa type"""
+        return {visa_type: bank.size for visa_type, bank in self._banks.items()}
@@ -1,7 +1,11 @@
 import os
+import time
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Callable
 import yaml
+import numpy as np
 
 import chromadb
 from chromadb.utils import embedding_functions
@@ -9,6 +13,9 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_community.embeddings import HuggingFaceEmbeddings
 
+from .question_selector import QuestionSelector
+from .embedding_cache import EmbeddingCache, CachedEmbeddings
+
 logger = logging.getLogger(__name__)
 
 # Load configuration
@@ -26,21 +33,133 @@ except Exception as e:
     logger.error(f"Failed to load config: {e}")
     config = {"rag": {"persist_directory": "data/chroma_db", "embedding_model": "sentence-transformers/all-MiniLM-L6-v2"}}
 
+# Every interview of a visa type asks the same question, so its ranking is computed once
+RANKING_QUERY = "Common {visa_type} visa interview questions"
+
+DEFAULT_QUESTIONS = {
+    "tourist": [
+        "What is the purpose of your visit to the United States?",
+        "How long do you plan to stay in the US?",
+        "What places will you visit during your trip?",
+        "Who is financing your trip?",
+        "What ties do you have to your home country?"
+    ],
+    "student": [
+        "Why did you choose this university?",
+        "How will you finance your education?",
+        "What are your plans after completing your studies?",
+        "What is your field of study and why did you choose it?",
+        "How will this degree benefit your career in your home country?"
+    ]
+}
+
 class RAGPipeline:
     """Retrieval-Augmented Generation pipeline for visa interview questions"""
     
-    def __init__(self):
-        """Initialize RAG pipeline with ChromaDB"""
+    def __init__(self, lazy: Optional[bool] = None):
+        """
+        Initialize RAG pipeline with ChromaDB.
+
+        Args:
+            lazy: Defer loading the embedding model and Chroma to the background warm-up;
+                defaults to the rag.lazy_load setting
+        """
         self.persist_directory = config["rag"].get("persist_directory", "data/chroma_db")
         self.embedding_model = config["rag"].get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
         
+        # Question embeddings per visa type, ranked against RANKING_QUERY
+        self.selector = QuestionSelector(config["rag"].get("selection", {}))
+        self._query_embeddings: Dict[str, np.ndarray] = {}
+
+        # Chroma and sentence-transformers block, so they run on a bounded pool
+        # instead of the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=config["rag"].get("workers", 2), thread_name_prefix="rag"
+        )
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+        # Embeddings survive restarts, so re-seeding the bank does not re-run the model
+        self.embedding_cache = EmbeddingCache(config["rag"].get("embedding_cache", {}))
+        self.embeddings = None
+        self.db = None
+        self.warmup: Dict[str, Any] = {"state": "pending", "duration_sec": None, "phases": {}, "error": None}
+        self._ready = asyncio.Event()
+        self._warmup_task: Optional[asyncio.Task] = None
+        self.warmup_wait_sec = config["rag"].get("warmup_wait_sec", 30)
+
+        if lazy is None:
+            lazy = config["rag"].get("lazy_load", True)
+        if not lazy:
+            self._warm_up_blocking()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the embedding model and question bank are loaded"""
+        return self.warmup["state"] == "ready"
+
+    def start_warm_up(self) -> asyncio.Task:
+        """Start loading the embedding model and question bank in the background"""
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warm_up())
+        return self._warmup_task
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the warm-up to finish, starting it if needed.
+
+        Args:
+            timeout: Maximum seconds to wait, or the rag.warmup_wait_sec setting
+
+        Returns:
+            Whether the pipeline is ready
+        """
+        if self.ready:
+            return True
+        self.start_warm_up()
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout or self.warmup_wait_sec)
+        except asyncio.TimeoutError:
+            logger.warning(f"RAG pipeline still {self.warmup['state']} after {timeout or self.warmup_wait_sec}s")
+        return self.ready
+
+    async def _warm_up(self):
+        """Run the blocking warm-up on the RAG thread pool and wake up waiting requests"""
+        if self.warmup["state"] == "pending":
+            await self._run("warm_up", self._warm_up_blocking)
+        self._ready.set()
+
+    def _warm_up_blocking(self):
+        """Load the embedding model, connect to Chroma and rank the question bank, timing each phase"""
+        self.warmup["state"] = "warming"
+        started = time.monotonic()
+        try:
+            self._load()
+        except Exception as e:
+            logger.error(f"RAG warm-up failed: {e}")
+            self.warmup.update(state="failed", error=str(e))
+            return
+        finally:
+            self.warmup["duration_sec"] = time.monotonic() - started
+        self.warmup["state"] = "ready"
+        phases = ", ".join(f"{name} {elapsed:.2f}s" for name, elapsed in self.warmup["phases"].items())
+        logger.info(f"RAG pipeline ready in {self.warmup['duration_sec']:.2f}s ({phases})")
+
+    def _load(self):
+        """Load the embedding model and question bank; blocking"""
+        phases = self.warmup["phases"]
+
         # Create persistence directory if it doesn't exist
         os.makedirs(self.persist_directory, exist_ok=True)
-        
-        # Initialize embeddings
-        self.embeddings = HuggingFaceEmbeddings(model_name=self.embedding_model)
-        
+
+        # The model itself is only loaded once a text misses the embedding cache
+        self.embeddings = CachedEmbeddings(
+            self.embedding_model,
+            self.embedding_cache,
+            lambda: HuggingFaceEmbeddings(model_name=self.embedding_model)
+        )
+
         # Connect to ChromaDB
+        phase_started = time.monotonic()
         try:
             self.db = Chroma(
                 persist_directory=self.persist_directory, 
@@ -57,6 +176,92 @@ class RAGPipeline:
             logger.error(f"Error connecting to ChromaDB: {e}")
             # Create a new ChromaDB instance
             self._initialize_with_default_questions()
+        phases["chroma"] = time.monotonic() - phase_started
+
+        phase_started = time.monotonic()
+        self._build_question_rankings()
+        phases["rankings"] = time.monotonic() - phase_started
+
+    def _build_question_rankings(self):
+        """Rank the whole question bank of every visa type against its fixed query"""
+        # Built aside and swapped in whole, since select may be reading the current one
+        selector = QuestionSelector(self.selector.config)
+        try:
+            collection = self.db.get(include=["documents", "metadatas", "embeddings"])
+            self._add_to_rankings(
+                collection["documents"], collection["metadatas"], collection["embeddings"], selector
+            )
+        except Exception as e:
+            logger.error(f"Failed to rank question bank: {e}")
+            return
+        self.selector = selector
+        logger.info(
+            "Ranked question bank: "
+            + ", ".join(f"{size} {visa_type}" for visa_type, size in selector.get_stats().items())
+        )
+
+    def _add_to_rankings(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings,
+        selector: Optional[QuestionSelector] = None
+    ) -> None:
+        """Insert questions into the ranking of their visa type; blocking"""
+        selector = selector or self.selector
+        by_type: Dict[str, Tuple[List[str], List[Any]]] = {}
+        for text, metadata, embedding in zip(texts, metadatas, embeddings):
+            visa_type = (metadata or {}).get("type")
+            if not visa_type:
+                continue
+            type_texts, type_embeddings = by_type.setdefault(visa_type, ([], []))
+            type_texts.append(text)
+            type_embeddings.append(embedding)
+
+        for visa_type, (type_texts, type_embeddings) in by_type.items():
+            selector.add(visa_type, type_texts, type_embeddings, self._query_embedding(visa_type))
+
+    def _query_embedding(self, visa_type: str) -> np.ndarray:
+        """Embed the ranking query of a visa type, once"""
+        if visa_type not in self._query_embeddings:
+            query = RANKING_QUERY.format(visa_type=visa_type)
+            self._query_embeddings[visa_type] = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        return self._query_embeddings[visa_type]
+
+    async def _run(self, operation: str, fn: Callable, *args):
+        """Run a blocking call on the RAG thread pool, recording its duration"""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._record_timing(operation, time.monotonic() - started)
+
+    def _record_timing(self, operation: str, elapsed: float) -> None:
+        timing = self.timings.setdefault(operation, {"calls": 0, "total_sec": 0.0, "max_sec": 0.0})
+        timing["calls"] += 1
+        timing["total_sec"] += elapsed
+        timing["max_sec"] = max(timing["max_sec"], elapsed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return question bank sizes, embedding cache statistics and per-operation timings"""
+        return {
+            "warmup": self.warmup,
+            "questions": self.selector.get_stats(),
+            "embedding_cache": {
+                **self.embedding_cache.get_stats(),
+                "model_load_sec": getattr(self.embeddings, "model_load_sec", None),
+            },
+            "timings": {
+                operation: {**timing, "avg_sec": timing["total_sec"] / timing["calls"]}
+                for operation, timing in self.timings.items()
+            },
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads and flush the embedding cache"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.embedding_cache.close()
 
     def _initialize_with_default_questions(self):
         """Initialize ChromaDB with default visa interview questions if empty"""
@@ -126,7 +331,8 @@ class RAGPipeline:
         self, 
         visa_type: str, 
         num_questions: int = 5,
-        use_llm_generation: bool = False
+        use_llm_generation: bool = False,
+        seed: Optional[int] = None
     ) -> List[str]:
         """
         Get relevant visa interview questions based on visa type.
@@ -135,82 +341,33 @@ class RAGPipeline:
             visa_type: Type of visa (tourist or student)
             num_questions: Number of questions to retrieve
             use_llm_generation: Whether to use LLM to generate new questions
+            seed: Seed for varying the selection between interviews
             
         Returns:
             List of questions
         """
         logger.info(f"Retrieving {num_questions} {visa_type} visa questions")
-        
-        try:
-            # Query ChromaDB for questions of the specified type
-            filter_dict = {"type": visa_type.lower()}
-            results = self.db.similarity_search_with_score(
-                query=f"Common {visa_type} visa interview questions",
-                k=num_questions * 2,  # Get more than needed to ensure diversity
-                filter=filter_dict
-            )
-            
-            # Extract questions and scores
-            questions_with_scores = [(doc.page_content, score) for doc, score in results]
-            
-            # Sort by relevance and take top N unique questions
-            questions_with_scores.sort(key=lambda x: x[1])
-            unique_questions = []
-            for q, _ in questions_with_scores:
-                if q not in unique_questions:
-                    unique_questions.append(q)
-                    if len(unique_questions) >= num_questions:
-                        break
-            
-            # If we don't have enough questions, use defaults
-            if len(unique_questions) < num_questions:
-                logger.warning(f"Not enough unique questions in DB. Using defaults.")
-                defaults = {
-                    "tourist": [
-                        "What is the purpose of your visit to the United States?",
-                        "How long do you plan to stay in the US?",
-                        "What places will you visit during your trip?",
-                        "Who is financing your trip?",
-                        "What ties do you have to your home country?"
-                    ],
-                    "student": [
-                        "Why did you choose this university?",
-                        "How will you finance your education?",
-                        "What are your plans after completing your studies?",
-                        "What is your field of study and why did you choose it?",
-                        "How will this degree benefit your career in your home country?"
-                    ]
-                }
-                
-                # Add default questions if needed
-                while len(unique_questions) < num_questions:
-                    idx = len(unique_questions) % len(defaults[visa_type])
-                    if defaults[visa_type][idx] not in unique_questions:
-                        unique_questions.append(defaults[visa_type][idx])
-            
-            logger.info(f"Retrieved {len(unique_questions)} questions for {visa_type} visa")
-            return unique_questions
-            
-        except Exception as e:
-            logger.error(f"Error retrieving questions: {e}")
-            # Return default questions if RAG fails
-            if visa_type == "tourist":
-                return [
-                    "What is the purpose of your visit to the United States?",
-                    "How long do you plan to stay in the US?",
-                    "What places will you visit during your trip?",
-                    "Who is financing your trip?",
-                    "What ties do you have to your home country?"
-                ][:num_questions]
-            else:  # student
-                return [
-                    "Why did you choose this university?",
-                    "How will you finance your education?",
-                    "What are your plans after completing your studies?",
-                    "What is your field of study and why did you choose it?",
-                    "How will this degree benefit your career in your home country?"
-                ][:num_questions]
-    
+
+        # Served from the in-memory bank; no embedding or vector search per request
+        visa_type = visa_type.lower()
+        if not self.ready and not await self.wait_ready():
+            logger.warning("RAG pipeline not ready, using default questions")
+        started = time.monotonic()
+        questions = self.selector.select(visa_type, num_questions, seed)
+        self._record_timing("select", time.monotonic() - started)
+
+        # If we don't have enough questions, use defaults
+        if len(questions) < num_questions:
+            logger.warning(f"Not enough unique questions in DB. Using defaults.")
+            for question in DEFAULT_QUESTIONS.get(visa_type, DEFAULT_QUESTIONS["student"]):
+                if len(questions) >= num_questions:
+                    break
+                if question not in questions:
+                    questions.append(question)
+
+        logger.info(f"Retrieved {len(questions)} questions for {visa_type} visa")
+        return questions
+
     async def add_questions(self, questions: List[Dict[str, Any]]) -> bool:
         """
         Add new questions to the ChromaDB.
@@ -221,15 +378,30 @@ class RAGPipeline:
         Returns:
             Success status
         """
+        if not await self.wait_ready():
+            logger.error("Cannot add questions: RAG pipeline is not ready")
+            return False
+
+        texts = [q["text"] for q in questions]
+        metadatas = [{"type": q["type"]} for q in questions]
         try:
-            texts = [q["text"] for q in questions]
-            metadatas = [{"type": q["type"]} for q in questions]
-            
-            self.db.add_texts(texts=texts, metadatas=metadatas)
-            self.db.persist()
-            
+            ids = await self._run("add_texts", self._store_questions, texts, metadatas)
             logger.info(f"Added {len(questions)} new questions to ChromaDB")
-            return True
         except Exception as e:
             logger.error(f"Error adding questions to ChromaDB: {e}")
             return False
+
+        # Rank only the new questions, reusing the embeddings Chroma just computed
+        try:
+            added = await self._run("get", lambda: self.db.get(ids=ids, include=["documents", "metadatas", "embeddings"]))
+            await self._run("rank", self._add_to_rankings, added["documents"], added["metadatas"], added["embeddings"])
+        except Exception as e:
+            logger.error(f"Failed to rank new questions, rebuilding rankings: {e}")
+            await self._run("rebuild_rankings", self._build_question_rankings)
+        return True
+
+    def _store_questions(self, texts: List[str], metadatas: List[Dict[str, Any]]) -> List[str]:
+        """Embed and persist questions; blocking"""
+        ids = self.db.add_texts(texts=texts, metadatas=metadatas)
+        self.db.persist()
+        return ids
@@ -0,0 +1,126 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Any, Callable, Set
+
+logger = logging.getLogger(__name__)
+
+
+class AudioRetentionManager:
+    """Keeps the audio output directory within a byte and file-count budget"""
+
+    def __init__(self, output_dir: str, config: Dict[str, Any], protected_files: Callable[[], Set[str]]):
+        """
+        Initialize the retention manager.
+
+        Args:
+            output_dir: Directory holding synthesized audio
+            config: Retention configuration
+            protected_files: Callable returning filenames still referenced by live sessions
+        """
+        self.output_dir = output_dir
+        self.max_bytes = config.get("max_bytes", 512 * 1024 * 1024)
+        self.max_files = config.get("max_files", 5000)
+        self.max_age_sec = config.get("max_age_sec", 7 * 24 * 3600)
+        self.partial_max_age_sec = config.get("partial_max_age_sec", 600)
+        self.interval_sec = config.get("interval_sec", 300)
+        self.protected_files = protected_files
+
+        self.stats: Dict[str, Any] = {
+            "files": 0,
+            "bytes": 0,
+            "protected": 0,
+            "evicted_files": 0,
+            "evicted_bytes": 0,
+            "sweeps": 0,
+            "last_sweep_at": None,
+            "last_sweep_ms": None,
+        }
+
+    async def run(self) -> None:
+        """Sweep the audio directory periodically until cancelled"""
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audio retention sweep failed: {str(e)}")
+            await asyncio.sleep(self.interval_sec)
+
+    async def sweep(self) -> None:
+        """Run one eviction pass without blocking the event loop"""
+        # Snapshot live references on the loop, then do the disk work in a thread
+        protected = set(self.protected_files())
+        await asyncio.to_thread(self._sweep, protected)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return retention statistics"""
+        return {
+            **self.stats,
+            "max_bytes": self.max_bytes,
+            "max_files": self.max_files,
+            "max_age_sec": self.max_age_sec,
+        }
+
+    def _sweep(self, protected: Set[str]) -> None:
+        """Evict expired files, then least recently used files until within budget"""
+        started = time.monotonic()
+        now = time.time()
+        candidates = []
+        total_bytes = 0
+        total_files = 0
+
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                stat = entry.stat()
+                age = now - stat.st_mtime
+
+                # Abandoned partial writes from interrupted syntheses
+                if entry.name.endswith(".part"):
+                    if age > self.partial_max_age_sec:
+                        self._evict(entry.name, stat.st_size)
+                    continue
+
+                if entry.name not in protected and age > self.max_age_sec:
+                    self._evict(entry.name, stat.st_size)
+                    continue
+
+                total_bytes += stat.st_size
+                total_files += 1
+                if entry.name not in protected:
+                    candidates.append((stat.st_mtime, entry.name, stat.st_size))
+
+        # Cache hits refresh mtime, so oldest mtime is least recently used
+        candidates.sort()
+        for _, name, size in candidates:
+            if total_bytes <= self.max_bytes and total_files <= self.max_files:
+                break
+            if self._evict(name, size):
+                total_bytes -= size
+                total_files -= 1
+
+        self.stats.update({
+            "files": total_files,
+            "bytes": total_bytes,
+            "protected": len(protected),
+            "sweeps": self.stats["sweeps"] + 1,
+            "last_sweep_at": now,
+            "last_sweep_ms": round((time.monotonic() - started) * 1000, 2),
+        })
+
+    def _evict(self, filename: str, size: int) -> bool:
+        """Delete a file and record the eviction"""
+        try:
+            os.remove(os.path.join(self.output_dir, filename))
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to evict audio file {filename}: {str(e)}")
+            return False
+        self.stats["evicted_files"] += 1
+        self.stats["evicted_bytes"] += size
+        return True
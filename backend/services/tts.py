@@ -3,11 +3,14 @@ import os
 import logging
 import asyncio
 import tempfile
+import time
 import uuid
-from typing import Dict, Any
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, Set
 
 import edge_tts
 
+from .tts_cache import TTSCache
 
 
 logger = logging.getLogger(__name__)
@@ -22,9 +25,30 @@ class TTSService:
         self.audio_format = config.get("audio_format", "mp3")
         self.rate = config.get("rate", "+0%")
         self.volume = config.get("volume", "+0%")
+        self.stream_chunk_size = config.get("stream_chunk_size", 16384)
         
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
+
+        # Content-addressed cache so repeated questions skip Edge TTS
+        cache_config = config.get("cache", {})
+        self.cache = TTSCache(self.output_dir, cache_config) if cache_config.get("enabled", True) else None
+
+        # Global bound on concurrent Edge TTS requests plus in-flight coalescing
+        self.max_concurrency = max(1, config.get("max_concurrency", 8))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Streaming syntheses that may outlive their listener while teeing to the cache
+        self._stream_tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "coalesced": 0,
+            "syntheses": 0,
+            "active": 0,
+            "queued": 0,
+            "queue_time_total": 0.0,
+            "queue_time_max": 0.0,
+        }
         
     async def synthesize(self, text: str, voice_id: str = None) -> str:
         """
@@ -41,27 +65,31 @@ class TTSService:
             # Use provided voice or default
             voice = voice_id or self.default_voice
             
-            # Generate unique filename
-            filename = f"{uuid.uuid4()}.{self.audio_format}"
-            filepath = os.path.join(self.output_dir, filename)
-            
-            # Ensure the output directory exists
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
             # Clean up text for TTS
             text = text.strip()
             if not text:
                 text = "No text provided."
-            
-            # Use Edge TTS to generate audio
-            communicate = edge_tts.Communicate(text, voice)
-            await communicate.save(filepath)
-            
-            # Return URL path
-            url_path = f"/audio/{filename}"
-            logger.info(f"Generated audio: {url_path}")
-            
-            return url_path
+
+            # Serve repeated requests straight from the cache
+            self.stats["requests"] += 1
+            cache_key = TTSCache.make_key(text, voice, self.rate, self.volume, self.audio_format)
+            if self.cache:
+                cached = self.cache.lookup(cache_key)
+                if cached:
+                    logger.info(f"TTS cache hit: /audio/{cached}")
+                    return f"/audio/{cached}"
+
+            # Coalesce concurrent identical requests onto one synthesis
+            task = self._inflight.get(cache_key)
+            if task is None:
+                task = asyncio.create_task(self._synthesize_to_file(text, voice, cache_key))
+                self._inflight[cache_key] = task
+                task.add_done_callback(lambda t: self._finish_inflight(cache_key, t))
+            else:
+                self.stats["coalesced"] += 1
+
+            # Shield so a cancelled waiter does not abort the shared synthesis
+            return await asyncio.shield(task)
             
         except Exception as e:
             logger.error(f"TTS error: {str(e)}")
@@ -69,6 +97,165 @@ class TTSService:
             # Return a default error audio path
             return "/audio/error.mp3"
     
+    async def _synthesize_to_file(self, text: str, voice: str, cache_key: str) -> str:
+        """Run one Edge TTS synthesis under the global concurrency limit"""
+        if self.cache:
+            filename = TTSCache.filename_for(cache_key, self.audio_format)
+        else:
+            # Generate unique filename
+            filename = f"{uuid.uuid4()}.{self.audio_format}"
+        filepath = os.path.join(self.output_dir, filename)
+
+        # Ensure the output directory exists
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        async with self._acquire_slot():
+            # Use Edge TTS to generate audio; write to a temp name so a
+            # half-written file is never served under its final URL
+            communicate = edge_tts.Communicate(text, voice, rate=self.rate, volume=self.volume)
+            partial_path = f"{filepath}.{uuid.uuid4().hex}.part"
+            try:
+                await communicate.save(partial_path)
+                os.replace(partial_path, filepath)
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+
+        if self.cache:
+            self.cache.store(cache_key, filename)
+
+        # Return URL path
+        url_path = f"/audio/{filename}"
+        logger.info(f"Generated audio: {url_path}")
+        return url_path
+
+    def _finish_inflight(self, cache_key: str, task: asyncio.Task) -> None:
+        """Drop a finished synthesis from the in-flight table"""
+        self._inflight.pop(cache_key, None)
+        if not task.cancelled() and task.exception() is not None:
+            # Waiters log the error themselves; retrieve it so an abandoned task stays quiet
+            logger.debug(f"Shared TTS synthesis failed: {str(task.exception())}")
+
+    @asynccontextmanager
+    async def _acquire_slot(self):
+        """Wait for a synthesis slot, recording time spent queued"""
+        queued_at = time.monotonic()
+        self.stats["queued"] += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.stats["queued"] -= 1
+        wait = time.monotonic() - queued_at
+        self.stats["syntheses"] += 1
+        self.stats["queue_time_total"] += wait
+        self.stats["queue_time_max"] = max(self.stats["queue_time_max"], wait)
+        self.stats["active"] += 1
+        try:
+            yield
+        finally:
+            self.stats["active"] -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return synthesis concurrency and queueing statistics"""
+        syntheses = self.stats["syntheses"]
+        return {
+            **self.stats,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": len(self._inflight),
+            "queue_time_avg": self.stats["queue_time_total"] / syntheses if syntheses else 0.0,
+        }
+
+    async def stream(self, text: str, voice_id: str = None, tee_to_cache: bool = True) -> AsyncIterator[bytes]:
+        """
+        Stream synthesized audio chunks as Edge TTS produces them.
+
+        Args:
+            text: Text to convert to speech
+            voice_id: Voice ID to use for synthesis
+            tee_to_cache: Also write the audio to the cache while streaming
+
+        Yields:
+            Encoded audio chunks in the configured format
+        """
+        voice = voice_id or self.default_voice
+        text = text.strip() or "No text provided."
+
+        cache_key = None
+        if self.cache:
+            cache_key = TTSCache.make_key(text, voice, self.rate, self.volume, self.audio_format)
+            cached = self.cache.lookup(cache_key)
+            if cached:
+                logger.info(f"TTS cache hit (stream): /audio/{cached}")
+                with open(os.path.join(self.output_dir, cached), "rb") as f:
+                    while True:
+                        data = f.read(self.stream_chunk_size)
+                        if not data:
+                            return
+                        yield data
+
+        # Synthesis runs in its own task and never waits on the listener, so a
+        # slow client cannot hold a synthesis slot while it drains the audio
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._synthesize_to_queue(text, voice, cache_key, tee_to_cache, queue))
+        self._stream_tasks.add(producer)
+        producer.add_done_callback(self._stream_tasks.discard)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Without a tee nobody needs the rest of an abandoned synthesis
+            if not producer.done() and not (self.cache and tee_to_cache):
+                producer.cancel()
+
+    async def _synthesize_to_queue(
+        self, text: str, voice: str, cache_key: str, tee_to_cache: bool, queue: asyncio.Queue
+    ) -> None:
+        """Synthesize into an unbounded queue, teeing to the cache; ends with None or the error"""
+        tee_file = None
+        filepath = partial_path = None
+        if self.cache and tee_to_cache:
+            filename = TTSCache.filename_for(cache_key, self.audio_format)
+            filepath = os.path.join(self.output_dir, filename)
+            partial_path = f"{filepath}.{uuid.uuid4().hex}.part"
+            tee_file = open(partial_path, "wb")
+
+        completed = False
+        try:
+            async with self._acquire_slot():
+                communicate = edge_tts.Communicate(text, voice, rate=self.rate, volume=self.volume)
+                async for chunk in communicate.stream():
+                    if chunk["type"] != "audio":
+                        continue
+                    if tee_file:
+                        tee_file.write(chunk["data"])
+                    queue.put_nowait(chunk["data"])
+            completed = True
+            queue.put_nowait(None)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            if tee_file:
+                tee_file.close()
+                if completed:
+                    os.replace(partial_path, filepath)
+                    self.cache.store(cache_key, filename)
+                    logger.info(f"Streamed and cached audio: /audio/{filename}")
+                elif os.path.exists(partial_path):
+                    os.remove(partial_path)
+
+    @property
+    def media_type(self) -> str:
+        """MIME type of the configured audio format"""
+        return {"mp3": "audio/mpeg", "wav": "audio/wav", "ogg": "audio/ogg", "webm": "audio/webm"}.get(
+            self.audio_format, f"audio/{self.audio_format}"
+        )
+
     async def get_available_voices(self) -> list:
         """
         Get list of available TTS voices.
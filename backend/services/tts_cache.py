@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTSCache:
+    """Content-addressed, size-bounded LRU cache of synthesized audio files"""
+
+    def __init__(self, output_dir: str, config: Optional[Dict[str, Any]] = None):
+        """Initialize the cache and load the persisted index from disk"""
+        config = config or {}
+        self.output_dir = output_dir
+        self.max_entries = config.get("max_entries", 500)
+        # Kept outside output_dir, which is served publicly under /audio
+        self.index_path = config.get("index_path", "data/tts_cache_index.json")
+        self.flush_interval = config.get("flush_interval_sec", 5.0)
+
+        # key -> filename, ordered from least to most recently used
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._dirty = False
+        self._last_flush = 0.0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        index_dir = os.path.dirname(self.index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so that trivially different inputs share a cache entry"""
+        text = unicodedata.normalize("NFC", text or "")
+        return " ".join(text.split())
+
+    @classmethod
+    def make_key(cls, text: str, voice: str, rate: str, volume: str, audio_format: str) -> str:
+        """
+        Build the content address for a synthesis request.
+
+        Args:
+            text: Text to synthesize
+            voice: Voice ID
+            rate: Speaking rate (e.g. "+0%")
+            volume: Volume adjustment (e.g. "+0%")
+            audio_format: Output audio format
+
+        Returns:
+            Hex digest identifying the audio content
+        """
+        payload = "\x1f".join([cls.normalize_text(text), voice, rate, volume, audio_format])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def filename_for(key: str, audio_format: str) -> str:
+        """Return the on-disk filename used for a cache key"""
+        return f"tts_{key[:32]}.{audio_format}"
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Look up a cached audio file.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Filename of the cached audio, or None on a miss
+        """
+        filename = self._entries.get(key)
+        if filename is None:
+            self.misses += 1
+            return None
+
+        filepath = os.path.join(self.output_dir, filename)
+        if not os.path.exists(filepath):
+            # File was removed behind our back; drop the stale entry
+            del self._entries[key]
+            self._mark_dirty()
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        try:
+            # Refresh mtime so age-based cleanup treats the file as recently used
+            os.utime(filepath, None)
+        except OSError:
+            pass
+        self._mark_dirty()
+        return filename
+
+    def store(self, key: str, filename: str) -> None:
+        """Register a freshly synthesized file and evict beyond the size bound"""
+        self._entries[key] = filename
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            # Only the index entry goes; the file may still be referenced by a live
+            # session, so deleting it is left to the retention sweeper
+            self._entries.popitem(last=False)
+        self._dirty = True
+        self.flush()
+
+    def flush(self) -> None:
+        """Persist the LRU index to disk if it has changed"""
+        if not self._dirty:
+            return
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(list(self._entries.items()), f)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        except OSError as e:
+            logger.warning(f"Failed to persist TTS cache index: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _mark_dirty(self) -> None:
+        """Flag the index as changed, flushing at most once per interval"""
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _load(self) -> None:
+        """Load the persisted index, dropping entries whose files are gone"""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path) as f:
+                items = json.load(f)
+            for key, filename in items:
+                if os.path.exists(os.path.join(self.output_dir, filename)):
+                    self._entries[key] = filename
+            logger.info(f"Loaded TTS cache index with {len(self._entries)} entries")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable TTS cache index: {str(e)}")
+            self._entries.clear()
@@ -112,73 +112,188 @@
 #     return silence_count >= 5  # Adjust threshold as needed
 
 import logging
-import numpy as np
 import webrtcvad
-from typing import Tuple
+from typing import Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
-# Initialize WebRTC VAD
-vad = webrtcvad.Vad(3)  # Aggressiveness level 3 (most aggressive)
+# Sample rates and frame durations accepted by WebRTC VAD
+SUPPORTED_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+SUPPORTED_FRAME_DURATIONS_MS = (10, 20, 30)
 
-# Global state variables
-silence_counter = 0
-speech_detected = False
 
-async def process_audio_with_vad(
-    audio_chunk: bytes, 
-    silence_threshold: int = 300
-) -> Tuple[bytes, bool]:
-    """
-    Process audio chunk with Voice Activity Detection.
-    
-    Args:
-        audio_chunk: Raw audio bytes
-        silence_threshold: Number of silent frames to consider end of speech
-        
-    Returns:
-        Tuple of (processed audio chunk, is_speech_ended)
-    """
-    global silence_counter, speech_detected
-    
-    try:
-        # WebRTC VAD requires specific frame sizes
-        frame_duration_ms = 30  # We'll use 30ms frames
-        is_speech = False
-        
-        # Calculate samples per frame (16kHz * 30ms = 480 samples)
-        # 16-bit audio means 2 bytes per sample = 960 bytes per frame
-        samples_per_frame = int(16000 * (frame_duration_ms / 1000.0))
-        bytes_per_frame = samples_per_frame * 2
-        
-        if len(audio_chunk) >= bytes_per_frame:
+class VADSession:
+    """Per-session voice activity detector with end-of-answer detection"""
+
+    def __init__(self, config: Dict[str, Any], sample_rate: int = 16000):
+        """
+        Initialize the detector for one recording stream.
+
+        Args:
+            config: Answer processing configuration
+            sample_rate: Sample rate of the incoming 16-bit mono PCM
+        """
+        if sample_rate not in SUPPORTED_SAMPLE_RATES:
+            raise ValueError(f"Unsupported VAD sample rate: {sample_rate}")
+        self.frame_duration_ms = config.get("vad_frame_ms", 30)
+        if self.frame_duration_ms not in SUPPORTED_FRAME_DURATIONS_MS:
+            raise ValueError(f"Unsupported VAD frame duration: {self.frame_duration_ms}")
+
+        self.sample_rate = sample_rate
+        self.vad = webrtcvad.Vad(config.get("vad_aggressiveness", 3))
+
+        # 16-bit audio means 2 bytes per sample
+        self.bytes_per_frame = int(sample_rate * self.frame_duration_ms / 1000) * 2
+
+        # Number of consecutive silent frames that ends the answer (1.5 s at 30 ms frames)
+        self.silence_threshold = config.get("silence_threshold", 50)
+        # Shorter pause that marks a segment boundary for incremental ASR
+        self.boundary_frames = config.get("vad_boundary_frames", 10)
+        # Unbroken speech needed before a pause can end the answer, so clicks,
+        # breaths or scattered noise while the candidate thinks do not
+        self.min_speech_frames = config.get("vad_min_speech_frames", 10)
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all state before a new recording"""
+        self._remainder = b""
+        self.speech_detected = False
+        self.silence_frames = 0
+        self.speech_run = 0
+        self.total_frames = 0
+        self.speech_ended = False
+
+    @property
+    def at_boundary(self) -> bool:
+        """Whether the stream currently sits in a pause long enough to cut a segment"""
+        return self.speech_detected and self.silence_frames >= self.boundary_frames
+
+    def process(self, audio_chunk: bytes) -> bool:
+        """
+        Run every complete frame of a chunk through the detector.
+
+        Args:
+            audio_chunk: 16-bit mono PCM bytes at the session's sample rate
+
+        Returns:
+            True once end of speech has been detected
+        """
+        data = self._remainder + audio_chunk if self._remainder else audio_chunk
+        usable = len(data) - len(data) % self.bytes_per_frame
+        self._remainder = data[usable:]
+
+        view = memoryview(data)
+        for offset in range(0, usable, self.bytes_per_frame):
             try:
-                # Just check first frame for speech
-                is_speech = vad.is_speech(audio_chunk[:bytes_per_frame], 16000)
+                is_speech = self.vad.is_speech(view[offset:offset + self.bytes_per_frame].tobytes(), self.sample_rate)
             except Exception as e:
                 logger.warning(f"VAD error: {str(e)}")
                 is_speech = True  # Default to assuming speech on error
-        else:
-            # If chunk is too small, assume it's not speech
-            is_speech = False
-        
-        # Update counters
+            self._update(is_speech)
+
+        return self.speech_ended
+
+    def _update(self, is_speech: bool) -> None:
+        """Update counters with one frame decision"""
+        self.total_frames += 1
         if is_speech:
-            silence_counter = 0
-            speech_detected = True
+            self.speech_run += 1
+            self.silence_frames = 0
+            if self.speech_run >= self.min_speech_frames:
+                self.speech_detected = True
         else:
-            silence_counter += 1
-        
+            self.speech_run = 0
+            self.silence_frames += 1
+
         # Speech ends after some silence following detected speech
-        speech_ended = speech_detected and silence_counter >= silence_threshold
-        
-        if speech_ended:
-            # Reset for next detection
-            silence_counter = 0
-            speech_detected = False
-        
-        return audio_chunk, speech_ended
-        
-    except Exception as e:
-        logger.error(f"VAD processing error: {str(e)}")
-        return audio_chunk, False  # Return original chunk with no speech end
\ No newline at end of file
+        if self.speech_detected and self.silence_frames >= self.silence_threshold:
+            self.speech_ended = True
+
+
+class SilenceCompactor:
+    """Trims leading/trailing silence and shortens long pauses before ASR upload"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the compactor with answer processing configuration"""
+        self.aggressiveness = config.get("vad_aggressiveness", 3)
+        self.frame_duration_ms = config.get("vad_frame_ms", 30)
+        self.padding_ms = config.get("trim_padding_ms", 150)
+        self.max_pause_ms = config.get("max_pause_ms", 600)
+        self.stats: Dict[str, int] = {"answers": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def compact(self, pcm: bytes, sample_rate: int = 16000) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Remove silence that carries no information for transcription.
+
+        Args:
+            pcm: 16-bit mono PCM bytes
+            sample_rate: Sample rate of the PCM
+
+        Returns:
+            Tuple of (compacted PCM, per-answer statistics)
+        """
+        bytes_per_frame = int(sample_rate * self.frame_duration_ms / 1000) * 2
+        num_frames = len(pcm) // bytes_per_frame
+        view = memoryview(pcm)
+        vad = webrtcvad.Vad(self.aggressiveness)
+
+        speech = []
+        for i in range(num_frames):
+            frame = view[i * bytes_per_frame:(i + 1) * bytes_per_frame].tobytes()
+            try:
+                speech.append(vad.is_speech(frame, sample_rate))
+            except Exception as e:
+                logger.warning(f"VAD error: {str(e)}")
+                speech.append(True)
+
+        if not any(speech):
+            # Nothing recognisable as speech; leave the decision to ASR
+            return pcm, self._record(len(pcm), len(pcm), sample_rate)
+
+        # Keep a little padding around speech so word edges are not clipped
+        pad = self.padding_ms // self.frame_duration_ms
+        keep = [False] * num_frames
+        for i, is_speech in enumerate(speech):
+            if is_speech:
+                for j in range(max(0, i - pad), min(num_frames, i + pad + 1)):
+                    keep[j] = True
+
+        # Internal pauses keep at most max_pause_ms including the padding
+        extra_pause = max(0, self.max_pause_ms // self.frame_duration_ms - 2 * pad)
+        first = keep.index(True)
+        last = num_frames - 1 - keep[::-1].index(True)
+        parts = []
+        i = first
+        while i <= last:
+            start = i
+            if keep[i]:
+                while i <= last and keep[i]:
+                    i += 1
+                parts.append(view[start * bytes_per_frame:i * bytes_per_frame])
+            else:
+                while i <= last and not keep[i]:
+                    i += 1
+                gap = min(i - start, extra_pause)
+                parts.append(view[start * bytes_per_frame:(start + gap) * bytes_per_frame])
+
+        compacted = b"".join(parts)
+        return compacted, self._record(len(pcm), len(compacted), sample_rate)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cumulative compaction statistics"""
+        return {**self.stats, "bytes_saved": self.stats["bytes_in"] - self.stats["bytes_out"]}
+
+    def _record(self, bytes_in: int, bytes_out: int, sample_rate: int) -> Dict[str, Any]:
+        """Accumulate statistics and build the per-answer report"""
+        self.stats["answers"] += 1
+        self.stats["bytes_in"] += bytes_in
+        self.stats["bytes_out"] += bytes_out
+        bytes_per_sec = sample_rate * 2
+        return {
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "bytes_saved": bytes_in - bytes_out,
+            "duration_in_sec": round(bytes_in / bytes_per_sec, 2),
+            "duration_out_sec": round(bytes_out / bytes_per_sec, 2),
+        }
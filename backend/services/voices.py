@@ -0,0 +1,72 @@
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+from models import VoiceOption
+
+logger = logging.getLogger(__name__)
+
+
+class VoiceCatalogue:
+    """In-process voice catalogue with TTL and stale-while-revalidate refresh"""
+
+    def __init__(self, tts_service, config: Dict[str, Any]):
+        """Initialize the catalogue, seeding it from the configured voice options"""
+        self.tts_service = tts_service
+        self.ttl = config.get("voice_catalogue_ttl_sec", 3600)
+        self.retry_interval = config.get("voice_catalogue_retry_sec", 60)
+
+        # The seed is served immediately but treated as stale so the first
+        # request triggers a background refresh
+        self._payload = self._serialize(self._seed_options(config.get("voice_options", [])))
+        self._expires_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def get_payload(self) -> bytes:
+        """
+        Return the pre-serialized voice list, refreshing in the background if stale.
+
+        Returns:
+            JSON-encoded list of voice options
+        """
+        if time.monotonic() >= self._expires_at and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return self._payload
+
+    async def refresh(self) -> None:
+        """Fetch the voice list from Edge TTS and swap in the new payload"""
+        voices = await self.tts_service.get_available_voices()
+        if not voices:
+            # Keep serving the stale payload and retry later
+            self._expires_at = time.monotonic() + self.retry_interval
+            return
+
+        options = [
+            VoiceOption(
+                voice_id=voice.get("ShortName", ""),
+                name=voice.get("ShortName", "").split("-")[-1],
+                language=voice.get("Locale", "").split("-")[0],
+                gender=voice.get("Gender", "")
+            ) for voice in voices
+        ]
+        self._payload = self._serialize(options)
+        self._expires_at = time.monotonic() + self.ttl
+        logger.info(f"Voice catalogue refreshed with {len(options)} voices")
+
+    @staticmethod
+    def _seed_options(voice_ids: List[str]) -> List[VoiceOption]:
+        """Build voice options from configured voice IDs"""
+        return [
+            VoiceOption(
+                voice_id=voice,
+                name=voice.split("-")[-1],
+                language="-".join(voice.split("-")[0:2])
+            ) for voice in voice_ids
+        ]
+
+    @staticmethod
+    def _serialize(options: List[VoiceOption]) -> bytes:
+        """Serialize voice options once so requests only copy bytes"""
+        return json.dumps([option.dict() for option in options]).encode("utf-8")
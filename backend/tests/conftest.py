@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+
+# Tests import the backend modules the same way main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def read_fixture(name: str) -> bytes:
+    """Return the bytes of a file in tests/fixtures"""
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+SAMPLE_RATE = 16000
+
+
+def voiced(seconds: float) -> np.ndarray:
+    """Syllable-modulated glottal-like buzz that WebRTC VAD classifies as speech"""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    phase = np.cumsum((120 + 20 * np.sin(2 * np.pi * 0.5 * t)) / SAMPLE_RATE)
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t - np.pi / 2))
+    return (2 * (phase % 1) - 1) * envelope * 8000
+
+
+def silence(seconds: float) -> np.ndarray:
+    return np.random.default_rng(0).normal(0, 30, int(SAMPLE_RATE * seconds))
+
+
+def pcm(*parts: np.ndarray) -> bytes:
+    return np.clip(np.concatenate(parts), -32768, 32767).astype("<i2").tobytes()
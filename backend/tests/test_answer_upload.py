@@ -0,0 +1,88 @@
+import asyncio
+import shutil
+
+import pytest
+
+import main
+from conftest import SAMPLE_RATE, read_fixture, voiced, silence, pcm
+from services.asr import Transcription
+from services.audio_buffer import AudioBuffer
+from services.audio_decode import decode_to_pcm
+from services.audio_utils import pcm_to_wav
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """Record what would be sent to the ASR backend"""
+    sent = []
+
+    async def transcribe(audio_data, language=None, filename="audio.webm", content_type="audio/webm"):
+        sent.append((bytes(audio_data), filename))
+        return Transcription("answer")
+
+    monkeypatch.setattr(main.asr_service, "transcribe", transcribe)
+    return sent
+
+
+@pytest.fixture
+def no_pool_decode(monkeypatch):
+    async def decode(audio):
+        raise AssertionError("answer was decoded again")
+
+    monkeypatch.setattr(main.audio_decoder, "decode", decode)
+
+
+def buffered(data: bytes, bytes_per_second=None) -> AudioBuffer:
+    buffer = AudioBuffer({}, bytes_per_second)
+    buffer.append(data)
+    return buffer
+
+
+def test_streamed_pcm_is_trimmed_before_upload(monkeypatch, uploads, no_pool_decode):
+    monkeypatch.setitem(main.decode_config, "upload_format", "wav")
+    audio = pcm(silence(1.5), voiced(2.0), silence(2.0))
+    decoded = buffered(audio, SAMPLE_RATE * 2)
+
+    transcript = asyncio.run(main.transcribe_answer("s", buffered(b"\x1a\x45\xdf\xa3" * 500), None, None, decoded))
+
+    trimmed, _ = main.silence_compactor.compact(audio, SAMPLE_RATE)
+    assert transcript == "answer"
+    assert len(trimmed) < len(audio) - 2 * SAMPLE_RATE * 2
+    assert uploads == [(pcm_to_wav(trimmed, SAMPLE_RATE), "audio.wav")]
+
+
+def test_original_upload_skips_decode(monkeypatch, uploads, no_pool_decode):
+    monkeypatch.setitem(main.decode_config, "upload_format", "original")
+    recording = read_fixture("answer.webm")
+
+    asyncio.run(main.transcribe_answer("s", buffered(recording), None, None))
+
+    assert uploads == [(recording, "audio.webm")]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_recording_is_decoded_and_trimmed_for_flac_upload(uploads):
+    recording = read_fixture("answer.webm")
+    asyncio.run(main.transcribe_answer("s", buffered(recording), None, None))
+
+    (flac, filename), = uploads
+    decoded = asyncio.run(decode_to_pcm(recording, "ffmpeg", SAMPLE_RATE, 20))
+    trimmed, _ = main.silence_compactor.compact(decoded, SAMPLE_RATE)
+    assert filename == "audio.flac"
+    assert len(trimmed) < len(decoded)
+    assert asyncio.run(decode_to_pcm(flac, "ffmpeg", SAMPLE_RATE, 20)) == trimmed
+
+
+def test_failed_flac_encoding_falls_back_to_wav(monkeypatch, uploads):
+    async def encode_flac(pcm):
+        raise RuntimeError("ffmpeg exited with status 1")
+
+    monkeypatch.setitem(main.decode_config, "upload_format", "flac")
+    monkeypatch.setattr(main.audio_decoder, "ffmpeg_path", "ffmpeg")
+    monkeypatch.setattr(main.audio_decoder, "encode_flac", encode_flac)
+    audio = pcm(silence(1.0), voiced(1.0), silence(1.0))
+
+    assert asyncio.run(main.transcribe_pcm("s", audio, SAMPLE_RATE)) == "answer"
+
+    trimmed, _ = main.silence_compactor.compact(audio, SAMPLE_RATE)
+    assert uploads == [(pcm_to_wav(trimmed, SAMPLE_RATE), "audio.wav")]
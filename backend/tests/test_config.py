@@ -0,0 +1,32 @@
+import os
+
+import yaml
+
+import main
+from services.evaluation import evaluation_cache
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "config.YAML")
+
+
+def test_services_use_the_repository_config():
+    with open(CONFIG_PATH) as f:
+        assert main.config == yaml.safe_load(f)
+
+    cache_config = main.config["evaluation"]["cache"]
+    assert evaluation_cache is main.evaluation_cache
+    assert evaluation_cache.sqlite_path == cache_config["sqlite_path"]
+    assert evaluation_cache.get_stats()["persistent"] == cache_config.get("enabled", True)
+
+
+def test_llm_clients_use_the_repository_config():
+    mistral = main.config["mistral"]
+    assert main.llm_clients.default_model == mistral["model"]
+    assert main.llm_clients.max_tokens == mistral.get("max_tokens", 1024)
+    assert main.llm_clients.timeout == mistral.get("timeout_sec", 120)
+
+
+def test_tts_cache_index_is_not_served_under_audio():
+    cache = main.tts_service.cache
+    assert cache.index_path == main.config["edge_tts"]["cache"]["index_path"]
+    served_dir = os.path.abspath(main.tts_service.output_dir)
+    assert os.path.commonpath([served_dir, os.path.abspath(cache.index_path)]) != served_dir
@@ -0,0 +1,59 @@
+import hashlib
+import multiprocessing
+import os
+
+import numpy as np
+
+from services.embedding_cache import EmbeddingStore
+
+DIM = 8
+
+
+def key(worker: int, i: int) -> str:
+    return hashlib.sha256(f"{worker}:{i}".encode()).hexdigest()
+
+
+def vector(worker: int, i: int) -> np.ndarray:
+    return np.full(DIM, worker * 1000 + i, dtype=np.float32)
+
+
+def fill(directory: str, worker: int) -> None:
+    """Append 300 vectors in small batches, as one uvicorn worker would"""
+    store = EmbeddingStore(directory, initial_capacity=16)
+    for batch in range(0, 300, 10):
+        indices = range(batch, batch + 10)
+        store.put([key(worker, i) for i in indices], np.stack([vector(worker, i) for i in indices]))
+    store.close()
+
+
+def test_processes_append_without_claiming_the_same_rows(tmp_path):
+    directory = str(tmp_path)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=fill, args=(directory, worker)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+        assert process.exitcode == 0
+
+    store = EmbeddingStore(directory)
+    assert len(store.rows) == 1200
+    assert len(set(store.rows.values())) == 1200
+    for worker in range(4):
+        for i in range(300):
+            np.testing.assert_array_equal(store.get(key(worker, i)), vector(worker, i))
+
+
+def test_malformed_index_line_discards_the_store(tmp_path):
+    directory = str(tmp_path)
+    store = EmbeddingStore(directory)
+    store.put([key(0, i) for i in range(3)], np.stack([vector(0, i) for i in range(3)]))
+    store.close()
+    with open(os.path.join(directory, "index.txt"), "a") as f:
+        f.write(f"{key(0, 3)}\n")
+
+    store = EmbeddingStore(directory)
+    assert store.rows == {}
+    assert store.get(key(0, 0)) is None
+    assert store.put([key(1, 0)], vector(1, 0)[None]) == 1
+    np.testing.assert_array_equal(EmbeddingStore(directory).get(key(1, 0)), vector(1, 0))
@@ -0,0 +1,134 @@
+"""
+Incremental transcription of a real MediaRecorder-style WebM/Opus recording.
+
+fixtures/answer.webm is 8.4 s of mono Opus at 48 kHz (1 s silence, 2.5 s voiced
+audio, a 0.9 s pause, 2 s voiced audio, 2 s silence), muxed by ffmpeg with
+``-c:a libopus -b:a 24k -cluster_time_limit 1000 -live 1 -f webm`` so it has
+one Cluster per second like a live browser recording.
+"""
+import asyncio
+import shutil
+
+import pytest
+
+from conftest import read_fixture
+from services.audio_buffer import AudioBuffer
+from services.audio_decode import decode_to_pcm
+from services.incremental_asr import IncrementalTranscriber, find_webm_clusters, WEBM_CLUSTER_ID
+
+# MediaRecorder timeslices do not line up with Clusters
+CHUNK_SIZES = [997, 1503, 211, 2400]
+
+
+def read_vint(data: bytes, offset: int):
+    """Decode an EBML variable-length integer, returning (value, length)"""
+    length = 9 - data[offset].bit_length()
+    value = data[offset] & ((1 << (8 - length)) - 1)
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+    return value, length
+
+
+def cluster_offsets(data: bytes):
+    """Walk the Segment's children with an EBML parser and return where each Cluster starts"""
+    _, id_length = read_vint(data, 0)
+    header_size, size_length = read_vint(data, id_length)
+    offset = id_length + size_length + header_size
+
+    # Segment element; its children follow the ID and size
+    offset += 4
+    _, size_length = read_vint(data, offset)
+    offset += size_length
+
+    clusters = []
+    while offset < len(data):
+        element_id = data[offset:offset + 4]
+        id_length = 9 - data[offset].bit_length()
+        size, size_length = read_vint(data, offset + id_length)
+        if element_id == WEBM_CLUSTER_ID:
+            clusters.append(offset)
+        offset += id_length + size_length + size
+    return clusters
+
+
+def chunks_of(data: bytes):
+    offset, i = 0, 0
+    while offset < len(data):
+        size = CHUNK_SIZES[i % len(CHUNK_SIZES)]
+        yield data[offset:offset + size]
+        offset += size
+        i += 1
+
+
+async def transcribe_fixture(data: bytes, config: dict):
+    """Feed the recording chunk by chunk and capture every uploaded segment"""
+    segments = []
+
+    async def transcribe(segment: bytes) -> str:
+        segments.append(segment)
+        return f"segment {len(segments)}"
+
+    buffer = AudioBuffer({})
+    transcriber = IncrementalTranscriber(transcribe, config, buffer)
+    for chunk in chunks_of(data):
+        buffer.append(chunk)
+        transcriber.add_chunk(chunk)
+    transcript = await transcriber.finish()
+    return segments, transcript
+
+
+def test_find_webm_clusters_matches_ebml_structure():
+    data = read_fixture("answer.webm")
+    expected = cluster_offsets(data)
+    assert len(expected) > 5
+
+    found, resume = find_webm_clusters(data)
+    assert found == [offset for offset in expected if offset < resume]
+
+
+def test_segments_start_at_clusters_with_one_cluster_overlap():
+    data = read_fixture("answer.webm")
+    clusters = cluster_offsets(data)
+    header = data[:clusters[0]]
+
+    segments, _ = asyncio.run(transcribe_fixture(data, {"min_segment_bytes": 4000, "max_segment_bytes": 8000}))
+    assert len(segments) > 2
+
+    assert data.startswith(segments[0])
+    ranges = [(0, len(segments[0]))]
+    for segment in segments[1:]:
+        # Every later segment is the container header plus whole Clusters
+        assert segment.startswith(header)
+        body = segment[len(header):]
+        start = data.find(body)
+        assert start in clusters
+        end = start + len(body)
+        assert end in clusters or end == len(data)
+        ranges.append((start, end))
+
+    for (previous_start, previous_end), (start, _) in zip(ranges, ranges[1:]):
+        # The next segment repeats exactly the last Cluster of the previous one
+        last_cluster = clusters[clusters.index(previous_end) - 1]
+        assert start == (last_cluster if last_cluster > previous_start else previous_end)
+    assert ranges[-1][1] == len(data)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_every_segment_decodes():
+    data = read_fixture("answer.webm")
+    segments, _ = asyncio.run(transcribe_fixture(data, {"min_segment_bytes": 4000, "max_segment_bytes": 8000}))
+
+    for segment in segments:
+        pcm = asyncio.run(decode_to_pcm(segment, shutil.which("ffmpeg"), 16000, 20))
+        assert len(pcm) > 16000 * 2 * 0.5
+
+
+def test_stitch_drops_words_repeated_by_overlap():
+    transcriber = IncrementalTranscriber(None, {}, AudioBuffer({}))
+    transcriber._overlapped = [False, True, False]
+    transcript = transcriber._stitch([
+        "I am travelling to visit my",
+        "sist- visit my sister in Boston.",
+        "I will come back home.",
+    ])
+    assert transcript == "I am travelling to visit my sister in Boston. I will come back home."
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from conftest import SAMPLE_RATE, voiced, pcm
+from models import InterviewSession, SubscriptionLevel, VisaType
+from services.asr import Transcription, normalize_language
+from services.audio_buffer import AudioBuffer
+
+
+@pytest.mark.parametrize("language, code", [
+    ("en", "en"), ("EN-us", "en"), ("pt_BR", "pt"), ("hindi", "hi"), ("xx", None), ("klingon", None), ("", None),
+])
+def test_normalize_language(language, code):
+    assert normalize_language(language) == code
+
+
+def test_start_interview_rejects_unknown_language():
+    response = TestClient(main.app).post("/api/startInterview", json={
+        "visa_type": "student", "subscription_level": "free", "voice_id": "v", "language": "xx"
+    })
+    assert response.status_code == 422
+
+
+class FakeWebSocket:
+    async def send_json(self, message):
+        pass
+
+
+def test_language_is_pinned_from_the_whole_answer(monkeypatch):
+    # The short first segment is misdetected; the rest of the answer outweighs it
+    detections = iter(["de", "en", "en"])
+
+    async def transcribe_detailed(segment, language=None, filename="audio.webm", content_type="audio/webm"):
+        return Transcription("words", next(detections))
+
+    monkeypatch.setattr(main.asr_service, "transcribe_detailed", transcribe_detailed)
+    monkeypatch.setitem(main.incremental_asr_config, "max_segment_bytes", 48000)
+    monkeypatch.setattr(main, "silence_compactor", None)
+
+    async def run():
+        session = InterviewSession(
+            session_id="lang", visa_type=VisaType.STUDENT, subscription_level=SubscriptionLevel.FREE,
+            voice_id="v", questions=["Why this university?"]
+        )
+        monkeypatch.setitem(main.active_sessions, "lang", session)
+        buffer = AudioBuffer({}, SAMPLE_RATE * 2)
+        transcriber = main.create_transcriber(FakeWebSocket(), "lang", buffer, SAMPLE_RATE)
+        audio = pcm(voiced(4.0))
+        for offset in range(0, len(audio), 16000):
+            buffer.append(audio[offset:offset + 16000])
+            transcriber.add_chunk(audio[offset:offset + 16000])
+        await asyncio.sleep(0.01)
+        assert session.language is None
+
+        await main.transcribe_answer("lang", buffer, transcriber, SAMPLE_RATE)
+        assert session.language == "en"
+
+    asyncio.run(run())
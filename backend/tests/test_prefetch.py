@@ -0,0 +1,34 @@
+import asyncio
+
+from services.prefetch import QuestionPrefetcher
+
+
+class FakeTTS:
+    async def synthesize(self, text, voice_id):
+        return f"/audio/{text}.mp3"
+
+
+def test_unclaimed_prefetches_expire():
+    async def run():
+        prefetcher = QuestionPrefetcher(FakeTTS(), {"prefetch_ttl_sec": 60})
+        prefetcher.schedule("abandoned", ["q0", "q1", "q2"], "voice")
+        await asyncio.sleep(0.01)
+        assert sorted(prefetcher.ready_audio_urls()) == ["/audio/q1.mp3", "/audio/q2.mp3"]
+
+        # As if the candidate walked away a minute ago
+        prefetcher._finished_at["abandoned"] -= 61
+        assert prefetcher.ready_audio_urls() == []
+        assert prefetcher._tasks == {}
+
+    asyncio.run(run())
+
+
+def test_fully_claimed_session_is_forgotten():
+    async def run():
+        prefetcher = QuestionPrefetcher(FakeTTS(), {})
+        prefetcher.schedule("s", ["q0", "q1"], "voice")
+        assert await prefetcher.get_audio_url("s", 1, "q1", "voice") == "/audio/q1.mp3"
+        assert prefetcher.ready_audio_urls() == []
+        assert prefetcher._tasks == {}
+
+    asyncio.run(run())
@@ -0,0 +1,47 @@
+import numpy as np
+
+from services.question_selector import QuestionSelector
+
+DIM = 16
+
+
+def make_selector(**overrides):
+    config = {"strategy": "mmr", "diversity": 0.5, "candidate_pool": 64, "temperature": 0.05}
+    config.update(overrides)
+    selector = QuestionSelector(config)
+
+    rng = np.random.default_rng(0)
+    topics = rng.normal(size=(10, DIM))
+    # Three near-identical phrasings per topic, so a redundant set is easy to pick
+    embeddings = np.repeat(topics, 3, axis=0) + rng.normal(scale=0.01, size=(30, DIM))
+    texts = [f"Topic {i // 3} question {i % 3}" for i in range(30)]
+    query = topics[:4].mean(axis=0)
+    selector.add("F1", texts, embeddings, query)
+    return selector
+
+
+def test_seeded_selection_is_deterministic():
+    selector = make_selector()
+
+    first = selector.select("F1", 8, seed=42)
+    assert selector.select("F1", 8, seed=42) == first
+    assert make_selector().select("F1", 8, seed=42) == first
+
+
+def test_selection_has_no_duplicates_and_spreads_over_topics():
+    selector = make_selector()
+
+    for seed in range(20):
+        selected = selector.select("F1", 8, seed=seed)
+        assert len(selected) == 8
+        assert len(set(selected)) == 8
+        topics = {text.split(" question ")[0] for text in selected}
+        assert len(topics) == 8
+
+
+def test_selection_is_capped_by_bank_size():
+    selector = make_selector()
+
+    selected = selector.select("F1", 50, seed=1)
+    assert sorted(selected) == sorted(f"Topic {i // 3} question {i % 3}" for i in range(30))
+    assert selector.select("J1", 5, seed=1) == []
@@ -0,0 +1,47 @@
+import asyncio
+
+import main
+from models import InterviewSession, SubscriptionLevel, VisaType
+
+
+def test_summary_fold_runs_after_evaluation(monkeypatch):
+    async def evaluate_answer(question, transcript, visa_type):
+        return main.evaluator_service.quick_evaluate(transcript).dict()
+
+    folding = asyncio.Event()
+    release = asyncio.Event()
+
+    async def update_summary(summary, number, question, answer, feedback, visa_type, max_words=150):
+        folding.set()
+        await release.wait()
+        return f"folded {number}"
+
+    summaries = []
+
+    async def generate_final_evaluation_from_summary(summary, **kwargs):
+        summaries.append(summary)
+        return {"overall_score": 80}
+
+    monkeypatch.setattr(main, "evaluate_answer", evaluate_answer)
+    monkeypatch.setattr(main.llm_service, "update_summary", update_summary)
+    monkeypatch.setattr(main.llm_service, "generate_final_evaluation_from_summary", generate_final_evaluation_from_summary)
+    monkeypatch.setitem(main.evaluation_config, "final_mode", "incremental")
+
+    async def run():
+        session = InterviewSession(
+            session_id="s", visa_type=VisaType.STUDENT, subscription_level=SubscriptionLevel.FREE,
+            voice_id="v", questions=["Why do you want to study here?"]
+        )
+        # The evaluation finishes while its fold is still waiting on the LLM
+        await asyncio.wait_for(main.record_answer(session, "I was admitted to a masters program."), 1)
+        await asyncio.wait_for(folding.wait(), 1)
+        assert session.scored_answers == 1
+
+        final = asyncio.create_task(session.generate_final_evaluation(main.llm_service, incremental=True))
+        await asyncio.sleep(0.05)
+        assert not final.done()
+        release.set()
+        await asyncio.wait_for(final, 1)
+        assert summaries == ["folded 1"]
+
+    asyncio.run(run())
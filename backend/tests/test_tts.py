@@ -0,0 +1,64 @@
+import asyncio
+
+import services.tts as tts_module
+from services.tts import TTSService
+
+
+class FakeCommunicate:
+    """Stand-in for edge_tts.Communicate that records how many syntheses ran"""
+
+    created = 0
+    active = 0
+    peak = 0
+
+    def __init__(self, text, voice, rate=None, volume=None):
+        FakeCommunicate.created += 1
+        self.text = text
+
+    async def save(self, path):
+        FakeCommunicate.active += 1
+        FakeCommunicate.peak = max(FakeCommunicate.peak, FakeCommunicate.active)
+        try:
+            await asyncio.sleep(0.05)
+            with open(path, "wb") as f:
+                f.write(self.text.encode("utf-8"))
+        finally:
+            FakeCommunicate.active -= 1
+
+
+def make_service(tmp_path, monkeypatch, **overrides):
+    monkeypatch.setattr(FakeCommunicate, "created", 0)
+    monkeypatch.setattr(FakeCommunicate, "peak", 0)
+    monkeypatch.setattr(tts_module.edge_tts, "Communicate", FakeCommunicate)
+    config = {
+        "output_dir": str(tmp_path / "audio"),
+        "cache": {"index_path": str(tmp_path / "tts_cache_index.json")},
+    }
+    config.update(overrides)
+    return TTSService(config)
+
+
+def test_concurrent_identical_requests_share_one_synthesis(tmp_path, monkeypatch):
+    async def run():
+        service = make_service(tmp_path, monkeypatch)
+        urls = await asyncio.gather(*(service.synthesize("Tell me about yourself.") for _ in range(10)))
+        return service, urls
+
+    service, urls = asyncio.run(run())
+
+    assert FakeCommunicate.created == 1
+    assert len(set(urls)) == 1 and urls[0].startswith("/audio/tts_")
+    assert service.stats["coalesced"] == 9
+    assert service.get_stats()["in_flight"] == 0
+
+
+def test_distinct_requests_are_bounded_by_max_concurrency(tmp_path, monkeypatch):
+    async def run():
+        service = make_service(tmp_path, monkeypatch, max_concurrency=2)
+        return await asyncio.gather(*(service.synthesize(f"Question {i}") for i in range(6)))
+
+    urls = asyncio.run(run())
+
+    assert FakeCommunicate.created == 6
+    assert len(set(urls)) == 6
+    assert FakeCommunicate.peak == 2
@@ -0,0 +1,66 @@
+import asyncio
+import shutil
+
+import pytest
+
+from conftest import SAMPLE_RATE, read_fixture, voiced, silence, pcm
+from services.audio_decode import AudioDecoder
+from services.vad import VADSession
+
+
+def feed(vad: VADSession, audio: bytes, chunk_bytes: int = 8000) -> float:
+    """Feed audio in chunks and return the time at which the answer ended, or -1"""
+    for offset in range(0, len(audio), chunk_bytes):
+        if vad.process(audio[offset:offset + chunk_bytes]):
+            return vad.total_frames * vad.frame_duration_ms / 1000
+    return -1
+
+
+def test_short_pause_does_not_end_answer():
+    vad = VADSession({}, SAMPLE_RATE)
+    assert feed(vad, pcm(silence(1.0), voiced(2.0), silence(0.9), voiced(2.0), silence(0.5))) == -1
+    assert vad.speech_detected
+
+
+def test_end_of_answer_after_default_pause():
+    vad = VADSession({}, SAMPLE_RATE)
+    ended_at = feed(vad, pcm(silence(1.0), voiced(2.0), silence(3.0)))
+    # Speech stops at 3.0 s; the answer ends once 1.5 s of silence has followed
+    assert 4.3 <= ended_at <= 4.8
+
+
+def test_leading_silence_does_not_end_answer():
+    vad = VADSession({}, SAMPLE_RATE)
+    assert feed(vad, pcm(silence(4.0))) == -1
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_end_of_answer_on_streamed_webm():
+    data = read_fixture("answer.webm")
+
+    async def run():
+        decoder = AudioDecoder({})
+        vad = VADSession({}, decoder.sample_rate)
+        stream = await decoder.open_stream(vad.process)
+        ended_at_byte = None
+        for offset in range(0, len(data), 997):
+            await stream.feed(data[offset:offset + 997])
+            await asyncio.sleep(0.01)
+            if vad.speech_ended and ended_at_byte is None:
+                ended_at_byte = offset
+        await stream.finish(10)
+        return vad, ended_at_byte, stream.decoded_bytes
+
+    vad, ended_at_byte, decoded_bytes = asyncio.run(run())
+    # The 0.9 s pause is kept; the 2 s of trailing silence ends the answer
+    assert vad.speech_ended
+    assert ended_at_byte is not None and ended_at_byte > len(data) * 0.8
+    assert abs(decoded_bytes / (2 * SAMPLE_RATE) - 8.4) < 0.1
+
+
+def test_scattered_noise_while_thinking_does_not_end_answer():
+    vad = VADSession({}, SAMPLE_RATE)
+    bursts = [part for _ in range(4) for part in (voiced(0.12), silence(0.48))]
+    ended_at = feed(vad, pcm(*bursts, silence(2.0), voiced(2.0), silence(3.0)))
+    # The answer itself starts at 4.4 s and ends 1.5 s after it stops at 6.4 s
+    assert 7.7 <= ended_at <= 8.2
@@ -190,6 +190,14 @@ const AudioRecorder = ({
             setStatus("completed");
           } else if (data.type === "status") {
             setStatus(data.recording ? "recording" : "idle");
+            // The server detected the end of the answer; stop capturing
+            if (
+              data.auto &&
+              mediaRecorderRef.current &&
+              mediaRecorderRef.current.state !== "inactive"
+            ) {
+              stopRecording();
+            }
           } else if (data.type === "error") {
             console.error("WebSocket error:", data.message);
             setError(`Recording error: ${data.message}`);
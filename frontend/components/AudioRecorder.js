@@ -50,6 +50,11 @@ const AudioRecorder = ({
 
           case 'status':
             setStatus(data.recording ? 'recording' : 'idle');
+            // The server detected the end of the answer; stop capturing
+            if (data.auto && mediaRecorderRef.current && mediaRecorderRef.current.state !== 'inactive') {
+              mediaRecorderRef.current.stop();
+              setIsRecording(false);
+            }
             break;
 
           case 'transcription':